@@ -0,0 +1,49 @@
+"""
+Benchmarks for task 2: summing income values extracted from text.
+
+Usage:
+    python -m benchmarks.bench_task_2 [number_of_values]
+"""
+
+import random
+import sys
+import timeit
+
+from tasks.task_2 import generator_numbers, sum_profit, sum_profit_fixed
+
+
+def make_text(count: int) -> str:
+    """Build a report-like text with *count* two-digit amounts."""
+    rng = random.Random(42)
+    words = ("дохід", "премія", "доларів", "і", "income", "bonus")
+    parts = []
+    for _ in range(count):
+        parts.append(rng.choice(words))
+        parts.append(f"{rng.randint(0, 100_000)}.{rng.randint(0, 99):02d}")
+    return " ".join(parts)
+
+
+def bench(label: str, func, repeat: int = 5) -> float:
+    """Print and return the best time of *repeat* runs of *func*."""
+    best = min(timeit.repeat(func, number=1, repeat=repeat))
+    print(f"{label:<32}{best * 1000:10.2f} ms")
+    return best
+
+
+def main(argv):
+    count = int(argv[1]) if len(argv) > 1 else 200_000
+    text = make_text(count)
+    assert sum_profit(text, generator_numbers) == sum_profit_fixed(text)
+
+    print(f"\nSumming {count} values:\n")
+    decimal_time = bench(
+        "sum_profit (Decimal)", lambda: sum_profit(text, generator_numbers)
+    )
+    fixed_time = bench(
+        "sum_profit_fixed (scaled int)", lambda: sum_profit_fixed(text)
+    )
+    print(f"\nSpeedup: {decimal_time / fixed_time:.2f}x\n")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
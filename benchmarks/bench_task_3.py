@@ -0,0 +1,66 @@
+"""
+Micro-benchmark for task 3: detecting the level of a log line.
+
+Compares the original substring scan over LOG_LEVELS with the positional
+parser used by count_logs.
+
+Usage:
+    python -m benchmarks.bench_task_3 [number_of_lines]
+"""
+
+import random
+import sys
+import timeit
+
+from tasks.task_3 import LOG_LEVELS, parse_level
+
+MESSAGES = (
+    "User logged in successfully.",
+    "Database connection failed.",
+    "Disk usage above 80%.",
+    "Starting data backup process.",
+    "Retrying request after upstream returned an error.",
+)
+
+
+def make_lines(count: int) -> list:
+    """Build *count* log lines in the "YYYY-MM-DD HH:MM:SS LEVEL message" format."""
+    rng = random.Random(42)
+    return [
+        f"2024-01-22 {rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:"
+        f"{rng.randint(0, 59):02d} {rng.choice(LOG_LEVELS)} {rng.choice(MESSAGES)}"
+        for _ in range(count)
+    ]
+
+
+def substring_scan(lines):
+    """The original count_logs loop body."""
+    for line in lines:
+        next((lvl for lvl in LOG_LEVELS if lvl in line.upper()), None)
+
+
+def positional_parse(lines):
+    """The positional parser used by count_logs."""
+    for line in lines:
+        parse_level(line)
+
+
+def bench(label: str, func, repeat: int = 5) -> float:
+    """Print and return the best time of *repeat* runs of *func*."""
+    best = min(timeit.repeat(func, number=1, repeat=repeat))
+    print(f"{label:<32}{best * 1000:10.2f} ms")
+    return best
+
+
+def main(argv):
+    count = int(argv[1]) if len(argv) > 1 else 500_000
+    lines = make_lines(count)
+
+    print(f"\nDetecting the level of {count} lines:\n")
+    scan_time = bench("substring scan", lambda: substring_scan(lines))
+    parse_time = bench("positional parse", lambda: positional_parse(lines))
+    print(f"\nSpeedup: {scan_time / parse_time:.2f}x\n")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
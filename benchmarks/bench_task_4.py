@@ -0,0 +1,66 @@
+"""
+Micro-benchmark for task 4: loading contacts into a journaled store.
+
+Compares calling add_contact once per row, as typing "add" would, with
+the batched import command.
+
+Usage:
+    python -m benchmarks.bench_task_4 [number_of_contacts]
+"""
+
+import csv
+import os
+import sys
+import tempfile
+import time
+
+import tasks.task_4 as task4
+
+
+def write_contacts(path: str, count: int) -> list:
+    """Write *count* contacts to a CSV file at *path* and return the rows."""
+    rows = [(f"user{i}", f"+38 (050) {i:07d}") for i in range(count)]
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        csv.writer(file).writerows(rows)
+    return rows
+
+
+def reset_store(directory: str):
+    """Start an empty store in *directory*."""
+    task4.close_store()
+    task4.USERS.clear()
+    task4.PHONES.clear()
+    task4.NAME_INDEX.clear()
+    task4.open_store(directory)
+
+
+def bench(label: str, func, count: int) -> float:
+    """Print and return the time of one run of *func* over *count* rows."""
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<24}{elapsed * 1000:10.2f} ms{count / elapsed * 60:14,.0f} rows/min")
+    return elapsed
+
+
+def main(argv):
+    count = int(argv[1]) if len(argv) > 1 else 200_000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "contacts.csv")
+        rows = write_contacts(path, count)
+
+        print(f"\nLoading {count} contacts:\n")
+        reset_store(os.path.join(tmp, "per_row"))
+        row_time = bench(
+            "add per row", lambda: [task4.add_contact(list(row)) for row in rows], count
+        )
+        reset_store(os.path.join(tmp, "import"))
+        import_time = bench("import", lambda: task4.import_contacts([path]), count)
+        task4.close_store()
+
+    print(f"\nSpeed-up: {row_time / import_time:.1f}x\n")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -1,18 +1,241 @@
-def caching_fibonacci():
+from array import array
+from collections import OrderedDict
+from concurrent.futures import Future
+import sqlite3
+import threading
+
+"""Supported computation strategies for :func:`caching_fibonacci`."""
+FIBONACCI_METHODS = ("recursive", "doubling")
+
+"""Gap between sorted batch indices above which fibonacci_batch jumps ahead
+with fast doubling instead of stepping through every index in between."""
+BATCH_JUMP = 256
+
+"""Largest modulus whose Pisano period is materialised by caching_fibonacci_mod."""
+PISANO_LIMIT = 100_000
+
+
+class _LRUCache(OrderedDict):
+    """Least-recently-used cache bounded by entry count and/or payload bytes.
+
+    The payload of an entry is the size of its integer value,
+    ``(value.bit_length() + 7) // 8`` bytes. Reading an entry marks it as
+    most recently used; inserting one evicts the oldest entries until both
+    limits hold again, but never below *keep* entries, so the *keep* most
+    recently used values may exceed *maxbytes*. Every eviction increments
+    ``owner.cache_evictions``.
+    """
+
+    def __init__(self, maxsize=None, maxbytes=None, keep=0):
+        super().__init__()
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.keep = keep
+        self.nbytes = 0
+        self.owner = None
+
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        self.move_to_end(key)
+        return value
+
+    def __setitem__(self, key, value):
+        if key in self:
+            self.nbytes -= _int_nbytes(super().__getitem__(key))
+            self.move_to_end(key)
+        super().__setitem__(key, value)
+        self.nbytes += _int_nbytes(value)
+        while len(self) > self.keep and (
+            (self.maxsize is not None and len(self) > self.maxsize)
+            or (self.maxbytes is not None and self.nbytes > self.maxbytes)
+        ):
+            _, evicted = self.popitem(last=False)
+            self.nbytes -= _int_nbytes(evicted)
+            if self.owner is not None:
+                self.owner.cache_evictions += 1
+
+
+def _int_nbytes(value: int) -> int:
+    """Return the number of bytes needed to store *value*'s magnitude."""
+    return (value.bit_length() + 7) // 8
+
+
+class FibonacciStore:
+    """Persistent on-disk cache of Fibonacci numbers backed by sqlite3.
+
+    The database is opened lazily on first use and values are looked up one
+    index at a time, so a fresh process starts instantly no matter how large
+    the store is. Every write runs in its own transaction, so a crash never
+    leaves a half-written value behind. The schema version is kept in a
+    ``meta`` table; a store written by an incompatible version is wiped and
+    rebuilt rather than misread.
+
+    Values are stored as big-endian byte strings since sqlite integers are
+    limited to 64 bits.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path):
+        self.path = path
+        self._conn = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database on first use and check its version header."""
+        if self._conn is not None:
+            return self._conn
+        conn = sqlite3.connect(self.path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        with conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)"
+            )
+            row = conn.execute(
+                "SELECT value FROM meta WHERE key = 'version'"
+            ).fetchone()
+            if row is None or row[0] != str(self.VERSION):
+                conn.execute("DROP TABLE IF EXISTS fibonacci")
+                conn.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('version', ?)",
+                    (str(self.VERSION),),
+                )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS fibonacci "
+                "(n INTEGER PRIMARY KEY, value BLOB NOT NULL)"
+            )
+        self._conn = conn
+        return conn
+
+    def get(self, n: int):
+        """Return the stored F(n), or None if *n* has not been stored yet."""
+        row = self._connect().execute(
+            "SELECT value FROM fibonacci WHERE n = ?", (n,)
+        ).fetchone()
+        return None if row is None else int.from_bytes(row[0], "big")
+
+    def put(self, n: int, value: int) -> None:
+        """Store F(n) atomically, replacing any previous value."""
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO fibonacci (n, value) VALUES (?, ?)",
+                (n, value.to_bytes(_int_nbytes(value), "big")),
+            )
+
+    def close(self) -> None:
+        """Close the underlying connection, if it was opened."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _fast_doubling(n: int, cache: dict, fibonacci) -> int:
+    """Compute F(n) with the fast-doubling identities, caching checkpoints.
+
+    Walks the bits of *n* from the most significant one, so only the
+    O(log n) prefixes ``n >> s`` are ever computed. Each visited prefix ``k``
+    is stored in *cache* together with ``k + 1``, which lets later calls
+    resume from the deepest shared checkpoint instead of starting over:
+
+        F(2k)     = F(k) * (2 * F(k + 1) - F(k))
+        F(2k + 1) = F(k) ** 2 + F(k + 1) ** 2
+
+    Args:
+        n (int): Index in the Fibonacci sequence, greater than 1.
+        cache (dict): Cache shared with the calling closure.
+        fibonacci: The public function whose counters are updated.
+
+    Returns:
+        int: The n-th Fibonacci number.
+    """
+    bits = n.bit_length()
+    start = bits
+    a, b = 0, 1  # F(0), F(1)
+    for shift in range(1, bits):
+        k = n >> shift
+        if k in cache and k + 1 in cache:
+            a, b = cache[k], cache[k + 1]
+            start = shift
+            fibonacci.cache_hits += 1
+            break
+
+    for shift in range(start - 1, -1, -1):
+        k = n >> shift
+        even = a * (2 * b - a)
+        odd = a * a + b * b
+        if k & 1:
+            a, b = odd, even + odd
+        else:
+            a, b = even, odd
+        cache[k] = a
+        cache[k + 1] = b
+        fibonacci.cache_misses += 1
+    return a
+
+
+def caching_fibonacci(
+    method: str = "recursive", maxsize=None, maxbytes=None, store=None
+):
     """Create a memoized Fibonacci function using a closure.
 
     The cache dictionary is created once and shared across all calls to the
     returned inner function, so previously computed values are never
     recalculated.
 
+    Two strategies are available:
+        - ``"recursive"`` — classic top-down memoization, caches every index
+          up to ``n``. Limited by the interpreter recursion depth.
+        - ``"doubling"``  — iterative fast doubling, O(log n) big-int
+          multiplications and only O(log n) cached checkpoints. Suitable
+          for indices in the millions.
+
+    By default the cache is unbounded. Passing *maxsize* and/or *maxbytes*
+    switches it to an LRU cache that evicts the least recently used entries
+    once the number of entries or their total size in bytes exceeds the limit.
+
+    Args:
+        method (str): One of :data:`FIBONACCI_METHODS`.
+        maxsize (int | None): Maximum number of cached entries. The
+            recursive method needs at least 3 to keep F(n-2) cached until
+            it is reused; anything smaller makes it exponential.
+        maxbytes (int | None): Maximum total size of cached values in bytes,
+            based on ``int.bit_length``. The recursive method always keeps
+            its three most recently used values, even above this cap, since
+            evicting F(n-2) before it is reused makes it exponential.
+        store (FibonacciStore | None): Optional persistent layer consulted
+            on every in-memory miss and updated with every computed value,
+            so results survive process restarts.
+
     Returns:
         fibonacci (Callable[[int], int]): A function that accepts a non-negative
             integer ``n`` and returns the n-th Fibonacci number.
             The returned function exposes two counters as attributes mainly for testing purposes:
             - ``cache_hits``   — number of times a result was served from cache
             - ``cache_misses`` — number of times a result was freshly computed
+            - ``cache_evictions`` — number of entries dropped by the LRU limits
+
+    Raises:
+        ValueError: If *method* is not supported, or *maxsize* is below 3
+            with the recursive method.
     """
-    cache = {}
+    if method not in FIBONACCI_METHODS:
+        raise ValueError(
+            f"Unknown method: {method}. Valid methods: {', '.join(FIBONACCI_METHODS)}"
+        )
+    if method == "recursive" and maxsize is not None and maxsize < 3:
+        raise ValueError(
+            f"maxsize={maxsize} is too small for the recursive method, use at least 3."
+        )
+    if maxsize is None and maxbytes is None:
+        cache = {}
+    else:
+        cache = _LRUCache(maxsize, maxbytes, keep=3 if method == "recursive" else 0)
 
     def fibonacci(n: int) -> int:
         """Return the n-th Fibonacci number, using a shared cache.
@@ -35,9 +258,256 @@ def caching_fibonacci():
         if n in cache:
             fibonacci.cache_hits += 1
             return cache[n]
-        cache[n] = fibonacci(n - 1) + fibonacci(n - 2)
-        fibonacci.cache_misses += 1
-        return cache[n]
+        if store is not None:
+            value = store.get(n)
+            if value is not None:
+                fibonacci.cache_hits += 1
+                cache[n] = value
+                return value
+        if method == "doubling":
+            value = _fast_doubling(n, cache, fibonacci)
+        else:
+            value = fibonacci(n - 1) + fibonacci(n - 2)
+            cache[n] = value
+            fibonacci.cache_misses += 1
+        if store is not None:
+            store.put(n, value)
+        return value
+
+    fibonacci.cache_hits = 0
+    fibonacci.cache_misses = 0
+    fibonacci.cache_evictions = 0
+    if isinstance(cache, _LRUCache):
+        cache.owner = fibonacci
+    return fibonacci
+
+
+def _fast_doubling_mod(n: int, m: int) -> int:
+    """Return F(n) mod m using fast doubling, without any caching.
+
+    All intermediate values are reduced modulo *m*, so every step works on
+    numbers smaller than ``m ** 2``.
+    """
+    a, b = 0, 1 % m
+    for shift in range(n.bit_length() - 1, -1, -1):
+        even = a * (2 * b - a) % m
+        odd = (a * a + b * b) % m
+        if (n >> shift) & 1:
+            a, b = odd, (even + odd) % m
+        else:
+            a, b = even, odd
+    return a
+
+
+def _pisano_table(m: int) -> array:
+    """Return F(0..p-1) mod m, where p is the Pisano period of *m*.
+
+    The sequence of residues is periodic and every period starts with the
+    pair ``(0, 1)``, so the table is complete once that pair reappears.
+    The period never exceeds ``6 * m``.
+    """
+    table = array("L" if m <= 1 << 32 else "Q", [0])
+    one = 1 % m
+    a, b = 0, one
+    while True:
+        a, b = b, (a + b) % m
+        if a == 0 and b == one:
+            return table
+        table.append(a)
+
+
+def caching_fibonacci_mod(pisano_limit: int = PISANO_LIMIT):
+    """Create a function computing Fibonacci numbers modulo m.
+
+    Works modulo *m* throughout instead of building the full integer.
+    For each modulus up to *pisano_limit* the first call detects its Pisano
+    period and caches one period of residues, so every later query with
+    the same modulus is a single table lookup. Larger moduli fall back to
+    fast doubling modulo *m*, O(log n) per call.
+
+    Args:
+        pisano_limit (int): Largest modulus whose period is cached.
+            A period table takes up to ``6 * m`` entries.
+
+    Returns:
+        fibonacci_mod (Callable[[int, int], int]): A function that accepts
+            an index ``n`` and a modulus ``m`` and returns F(n) mod m.
+            Exposes the same ``cache_hits`` / ``cache_misses`` counters as
+            :func:`caching_fibonacci`.
+    """
+    periods = {}
+
+    def fibonacci_mod(n: int, m: int) -> int:
+        """Return F(n) mod m. Negative values of ``n`` are treated as 0.
+
+        Args:
+            n (int): Index in the Fibonacci sequence (0-based).
+            m (int): Positive modulus.
+
+        Returns:
+            int: The n-th Fibonacci number reduced modulo *m*.
+
+        Raises:
+            ValueError: If *m* is not positive.
+        """
+        if m < 1:
+            raise ValueError(f"Modulus must be positive, got {m}.")
+        if n <= 0:
+            return 0
+        table = periods.get(m)
+        if table is not None:
+            fibonacci_mod.cache_hits += 1
+            return table[n % len(table)]
+        fibonacci_mod.cache_misses += 1
+        if m > pisano_limit:
+            return _fast_doubling_mod(n, m)
+        table = periods[m] = _pisano_table(m)
+        return table[n % len(table)]
+
+    fibonacci_mod.cache_hits = 0
+    fibonacci_mod.cache_misses = 0
+    return fibonacci_mod
+
+
+def _fib_pair(n: int) -> tuple:
+    """Return ``(F(n), F(n + 1))`` using fast doubling, without any caching."""
+    a, b = 0, 1
+    for shift in range(n.bit_length() - 1, -1, -1):
+        even = a * (2 * b - a)
+        odd = a * a + b * b
+        if (n >> shift) & 1:
+            a, b = odd, even + odd
+        else:
+            a, b = even, odd
+    return a, b
+
+
+def _to_array(values: list):
+    """Convert *values* to a NumPy array, uint64 when every value fits."""
+    try:
+        import numpy as np
+    except ImportError as e:
+        raise ImportError("as_array=True requires numpy: pip install numpy") from e
+    if all(value < 1 << 64 for value in values):
+        return np.array(values, dtype=np.uint64)
+    return np.array(values, dtype=object)
+
+
+def fibonacci_batch(indices, as_array: bool = False):
+    """Return the Fibonacci numbers for many indices at once.
+
+    The indices are deduplicated and sorted, and the sequence is walked once
+    in ascending order: small gaps are covered by plain additions, gaps
+    larger than :data:`BATCH_JUMP` by a single fast-doubling jump. Results
+    come back in the order of *indices*.
+
+    Negative indices are treated as 0, like in :func:`caching_fibonacci`.
+
+    Args:
+        indices (Iterable[int]): Indices in the Fibonacci sequence (0-based).
+        as_array (bool): Return a NumPy array instead of a list — ``uint64``
+            when all values fit, ``object`` otherwise. Requires numpy.
+
+    Returns:
+        list[int] | numpy.ndarray: F(n) for every n in *indices*.
+    """
+    indices = list(indices)
+    values = {}
+    k, a, b = 0, 0, 1  # a = F(k), b = F(k + 1)
+    for n in sorted({n for n in indices if n > 0}):
+        if n - k > BATCH_JUMP:
+            a, b = _fib_pair(n)
+        else:
+            for _ in range(n - k):
+                a, b = b, a + b
+        k = n
+        values[n] = a
+    result = [values.get(n, 0) for n in indices]
+    return _to_array(result) if as_array else result
+
+
+def fibonacci_range(start: int, stop: int, as_array: bool = False):
+    """Return ``[F(start), ..., F(stop - 1)]``, like ``range(start, stop)``.
+
+    Only the first value is computed with fast doubling, every next one is
+    a single addition.
+
+    Args:
+        start (int): First index (inclusive). Negative indices yield 0.
+        stop (int): Last index (exclusive).
+        as_array (bool): Same as in :func:`fibonacci_batch`.
+
+    Returns:
+        list[int] | numpy.ndarray: Consecutive Fibonacci numbers.
+    """
+    result = [0] * max(0, min(stop, 0) - start)
+    a, b = _fib_pair(max(start, 0))
+    for _ in range(max(start, 0), stop):
+        result.append(a)
+        a, b = b, a + b
+    return _to_array(result) if as_array else result
+
+
+def threadsafe_caching_fibonacci():
+    """Create a memoized Fibonacci function that is safe to share across threads.
+
+    A single lock guards the cache, the counters and a table of in-flight
+    computations. It is held only for dictionary lookups, never while a
+    value is computed, so contention stays low. Concurrent calls for the
+    same uncached ``n`` are coalesced (single-flight): the first caller
+    computes the value with fast doubling, the others wait on its
+    :class:`~concurrent.futures.Future`.
+
+    Returns:
+        fibonacci (Callable[[int], int]): Same contract as the function
+            returned by :func:`caching_fibonacci`. ``cache_misses`` counts
+            values actually computed, ``cache_hits`` counts calls served
+            from cache or from another thread's in-flight computation.
+    """
+    cache = {}
+    in_flight = {}
+    lock = threading.Lock()
+
+    def fibonacci(n: int) -> int:
+        """Return the n-th Fibonacci number, using the shared cache.
+
+        Args:
+            n (int): Index in the Fibonacci sequence (0-based).
+
+        Returns:
+            int: The n-th Fibonacci number.
+        """
+        if n <= 0:
+            return 0
+        if n == 1:
+            return 1
+        with lock:
+            if n in cache:
+                fibonacci.cache_hits += 1
+                return cache[n]
+            future = in_flight.get(n)
+            if future is None:
+                future = in_flight[n] = Future()
+                fibonacci.cache_misses += 1
+                owner = True
+            else:
+                fibonacci.cache_hits += 1
+                owner = False
+        if not owner:
+            return future.result()
+
+        try:
+            value = _fib_pair(n)[0]
+        except BaseException as e:
+            with lock:
+                del in_flight[n]
+            future.set_exception(e)
+            raise
+        with lock:
+            cache[n] = value
+            del in_flight[n]
+        future.set_result(value)
+        return value
 
     fibonacci.cache_hits = 0
     fibonacci.cache_misses = 0
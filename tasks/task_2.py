@@ -5,10 +5,35 @@ Provides a generator that extracts floating-point numbers from a string
 and a helper that sums them using any compatible callable.
 """
 
-from decimal import ROUND_HALF_UP, Decimal
+from concurrent.futures import ProcessPoolExecutor
+from decimal import ROUND_HALF_UP, Decimal, localcontext
+import mmap
+import os
 import re
 from typing import Callable
 
+"""Standalone floating-point literal, e.g. ``27.45`` but not ``abc1.23xyz``."""
+NUMBER_PATTERN = re.compile(r"\b\d+\.\d+\b")
+
+"""Same as NUMBER_PATTERN, capturing the whole and fractional digits apart."""
+NUMBER_PARTS_PATTERN = re.compile(r"\b(\d+)\.(\d+)\b")
+
+"""Characters that can never be part of a match or decide its word boundary."""
+SEPARATOR_PATTERN = re.compile(r"[^\w.]")
+
+"""NUMBER_PATTERN for UTF-8 bytes. Bytes patterns only know ASCII word
+characters, so a non-ASCII neighbour has to be checked separately."""
+NUMBER_BYTES_PATTERN = re.compile(rb"(?<!\w)\d+\.\d+(?!\w)")
+
+"""ASCII separator byte: a safe place to cut UTF-8 encoded input."""
+SEPARATOR_BYTES_PATTERN = re.compile(rb"[^\w.\x80-\xff]")
+
+"""Number of characters read at a time by generator_numbers_stream."""
+CHUNK_SIZE = 1 << 20
+
+"""Target number of bytes scanned by one sum_profit_parallel task."""
+SHARD_SIZE = 64 << 20
+
 
 def generator_numbers(text: str):
     """Yield every floating-point number found in *text* as a Decimal.
@@ -22,11 +47,135 @@ def generator_numbers(text: str):
     Yields:
         Decimal: The next floating-point number found in *text*.
     """
-    pattern = r"\b\d+\.\d+\b"
-    for match in re.finditer(pattern, text):
+    for match in NUMBER_PATTERN.finditer(text):
         yield Decimal(match.group())
 
 
+def _is_word_char(char: str) -> bool:
+    """Return True if *char* is a word character for a ``str`` regex (``\\w``)."""
+    return char.isalnum() or char == "_"
+
+
+def _word_char_before(buffer, pos: int) -> bool:
+    """Return True if a non-ASCII word character ends right before *pos*."""
+    if pos == 0 or buffer[pos - 1] < 0x80:
+        return False
+    start = pos - 1
+    while start > max(pos - 4, 0) and 0x80 <= buffer[start] < 0xC0:
+        start -= 1
+    return _is_word_char(buffer[start:pos].decode("utf-8", "replace"))
+
+
+def _word_char_after(buffer, pos: int) -> bool:
+    """Return True if a non-ASCII word character starts at *pos*."""
+    if pos >= len(buffer) or buffer[pos] < 0x80:
+        return False
+    lead = buffer[pos]
+    length = 2 if lead < 0xE0 else 3 if lead < 0xF0 else 4
+    return _is_word_char(buffer[pos : pos + length].decode("utf-8", "replace"))
+
+
+def generator_numbers_bytes(buffer):
+    """Yield every floating-point number found in UTF-8 encoded *buffer*.
+
+    Same matches as ``generator_numbers(buffer.decode("utf-8"))``, but the
+    buffer is scanned as raw bytes: only the ASCII digits of each match are
+    decoded. When a candidate touches a non-ASCII character, that single
+    character is decoded to check whether it is a word character (e.g.
+    Cyrillic letters are, an em dash is not), and the scan resumes one byte
+    later, just like the ``str`` regex would.
+
+    Args:
+        buffer: A ``bytes``-like object or an ``mmap``.
+
+    Yields:
+        Decimal: The next floating-point number found in *buffer*.
+    """
+    pos = 0
+    while True:
+        match = NUMBER_BYTES_PATTERN.search(buffer, pos)
+        if not match:
+            return
+        start, end = match.span()
+        if _word_char_before(buffer, start) or _word_char_after(buffer, end):
+            pos = start + 1
+            continue
+        yield Decimal(match.group().decode("ascii"))
+        pos = end
+
+
+def generator_numbers_mmap(path):
+    """Yield every floating-point number from a UTF-8 file without decoding it.
+
+    The file is memory-mapped and scanned by :func:`generator_numbers_bytes`,
+    so neither the text around the numbers is decoded nor the file copied
+    into memory.
+
+    Args:
+        path: Path to a UTF-8 text file.
+
+    Yields:
+        Decimal: The next floating-point number found in the file.
+    """
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            yield from generator_numbers_bytes(buffer)
+
+
+def _split_complete(buffer: str) -> tuple:
+    """Split *buffer* into a part that is safe to scan and a carry-over tail.
+
+    The split happens right after the last separator character (anything
+    but a word character or a dot). No match can cross a separator, and a
+    separator is a word boundary on its own, so scanning both parts apart
+    gives exactly the same matches as scanning them together.
+
+    Returns:
+        tuple[str, str]: ``(head, tail)`` with ``head + tail == buffer``.
+            *head* is empty if *buffer* contains no separator.
+    """
+    for i in range(len(buffer) - 1, -1, -1):
+        if SEPARATOR_PATTERN.match(buffer, i):
+            return buffer[: i + 1], buffer[i + 1 :]
+    return "", buffer
+
+
+def _scan_chunks(file, chunk_size: int):
+    """Yield numbers from a text file object read *chunk_size* characters at a time."""
+    carry = ""
+    while True:
+        chunk = file.read(chunk_size)
+        if not chunk:
+            break
+        head, carry = _split_complete(carry + chunk)
+        yield from generator_numbers(head)
+    yield from generator_numbers(carry)
+
+
+def generator_numbers_stream(source, chunk_size: int = CHUNK_SIZE):
+    """Yield every floating-point number from a file, reading it in chunks.
+
+    Streaming counterpart of :func:`generator_numbers` with the same
+    matching rules. Only one chunk plus the unfinished token at its end is
+    kept in memory, so numbers split across chunk boundaries are still
+    found and memory use does not depend on the file size.
+
+    Args:
+        source: Path to a UTF-8 text file, or an open text file object.
+        chunk_size: Number of characters to read at a time.
+
+    Yields:
+        Decimal: The next floating-point number found in the file.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "r", encoding="utf-8") as file:
+            yield from _scan_chunks(file, chunk_size)
+    else:
+        yield from _scan_chunks(source, chunk_size)
+
+
 def sum_profit(text: str, func: Callable) -> Decimal:
     """Return the sum of all numbers produced by *func* applied to *text*.
 
@@ -46,6 +195,253 @@ def sum_profit(text: str, func: Callable) -> Decimal:
     return total.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
 
 
+def _sum_scaled(numbers, scale: int = 2) -> tuple:
+    """Sum numeric literals exactly as a scaled integer.
+
+    Each literal, given as its ``(whole, fraction)`` digit strings, becomes
+    the integer ``int(whole + fraction)`` at scale ``len(fraction)``. The running total
+    is kept at the largest scale seen so far, rescaling it whenever a
+    literal with more fractional digits shows up, so no digit is ever lost.
+
+    Args:
+        numbers: Iterable of pairs such as ``("27", "45")``.
+        scale: Initial number of fractional digits of the total.
+
+    Returns:
+        tuple[int, int]: ``(total, scale)`` meaning ``total / 10 ** scale``.
+    """
+    total = 0
+    for whole, fraction in numbers:
+        digits = len(fraction)
+        if digits == scale:
+            total += int(whole + fraction)
+        elif digits < scale:
+            total += int(whole + fraction) * 10 ** (scale - digits)
+        else:
+            total = total * 10 ** (digits - scale) + int(whole + fraction)
+            scale = digits
+    return total, scale
+
+
+def _scaled_to_decimal(total: int, scale: int) -> Decimal:
+    """Convert a scaled integer total to a Decimal rounded like sum_profit.
+
+    The precision is raised to fit every digit of *total*, so totals beyond
+    the default 28 significant digits are rounded only to cents.
+    """
+    digits = f"{total}"
+    exact = Decimal(f"{digits}E-{scale}")
+    with localcontext() as context:
+        context.prec = max(context.prec, len(digits) + 3)
+        return exact.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+
+
+def sum_profit_fixed(text: str, scale: int = 2) -> Decimal:
+    """Sum all numbers in *text* exactly, faster than :func:`sum_profit`.
+
+    Every match is parsed straight into a scaled integer and added as a
+    native int; a single Decimal is built at the very end. The total is
+    exact and rounded with ROUND_HALF_UP, just like :func:`sum_profit`.
+    The results are equal while totals fit in 28 significant digits;
+    beyond that :func:`sum_profit` is rounded by the default Decimal
+    context on every addition, while this function sums exactly and only
+    rounds the final total to cents.
+
+    Args:
+        text: Arbitrary string that may contain floating-point literals.
+        scale: Expected number of fractional digits (2 for cents). Inputs
+            with more digits are still summed exactly, at a small cost.
+
+    Returns:
+        Decimal: Total sum rounded to two decimal places.
+    """
+    return _scaled_to_decimal(*_sum_scaled(NUMBER_PARTS_PATTERN.findall(text), scale))
+
+
+def _merge_scaled(parts) -> tuple:
+    """Add up ``(total, scale)`` pairs exactly, at the largest scale among them."""
+    parts = list(parts)
+    scale = max((part_scale for _, part_scale in parts), default=2)
+    total = sum(part * 10 ** (scale - part_scale) for part, part_scale in parts)
+    return total, scale
+
+
+def _shard_bounds(read_at, size: int, shards: int) -> list:
+    """Split ``[0, size)`` into up to *shards* ranges cut right after separators.
+
+    Args:
+        read_at: Callable ``(offset, length) -> bytes`` reading the input.
+        size: Input size in bytes.
+        shards: Desired number of ranges.
+
+    Returns:
+        list[tuple[int, int]]: Non-empty ``(start, end)`` byte ranges
+            covering the whole input in order.
+    """
+    bounds = [0]
+    for i in range(1, shards):
+        offset = max(size * i // shards, bounds[-1])
+        while offset < size:
+            window = read_at(offset, 4096)
+            found = SEPARATOR_BYTES_PATTERN.search(window)
+            if found:
+                offset += found.end()
+                break
+            offset += len(window)
+        bounds.append(min(offset, size))
+    bounds.append(size)
+    return [(start, end) for start, end in zip(bounds, bounds[1:]) if start < end]
+
+
+def _sum_bytes(data: bytes, scale: int) -> tuple:
+    """Worker: decode a shard and sum its numbers as a scaled integer."""
+    return _sum_scaled(NUMBER_PARTS_PATTERN.findall(data.decode("utf-8")), scale)
+
+
+def _sum_file_range(path, start: int, end: int, scale: int) -> tuple:
+    """Worker: read ``[start, end)`` of *path* and sum its numbers."""
+    with open(path, "rb") as file:
+        file.seek(start)
+        return _sum_bytes(file.read(end - start), scale)
+
+
+def sum_profit_parallel(
+    source, workers=None, scale: int = 2, shard_size: int = SHARD_SIZE
+) -> Decimal:
+    """Sum all numbers of a large UTF-8 input on several CPU cores.
+
+    The input is split into byte ranges of about *shard_size* bytes, each
+    cut right after an ASCII separator byte, so no number and no multi-byte
+    character is ever split. Shards are scanned in a
+    :class:`~concurrent.futures.ProcessPoolExecutor` and their scaled
+    integer totals are added exactly, so the result is the same as
+    :func:`sum_profit_fixed` on the decoded text.
+
+    Args:
+        source: Path to a UTF-8 file, or a ``bytes``-like buffer.
+        workers: Number of worker processes (defaults to the CPU count).
+        scale: Same as in :func:`sum_profit_fixed`.
+        shard_size: Target number of bytes per task. Inputs no larger than
+            this are summed in this process.
+
+    Returns:
+        Decimal: Total sum rounded to two decimal places.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        size = os.path.getsize(source)
+
+        def read_at(offset, length):
+            with open(source, "rb") as file:
+                file.seek(offset)
+                return file.read(length)
+
+    else:
+        source = memoryview(source).cast("B")
+        size = len(source)
+
+        def read_at(offset, length):
+            return bytes(source[offset : offset + length])
+
+    workers = workers or os.cpu_count() or 1
+    if size <= shard_size:
+        # a single shard of work doesn't pay for starting a process pool
+        workers = 1
+    shards = _shard_bounds(read_at, size, max(workers, -(-size // shard_size)))
+    if len(shards) <= 1 or workers == 1:
+        parts = [_sum_bytes(read_at(start, end - start), scale) for start, end in shards]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            tasks = []
+            for start, end in shards:
+                if isinstance(source, memoryview):
+                    task = pool.submit(_sum_bytes, bytes(source[start:end]), scale)
+                else:
+                    task = pool.submit(_sum_file_range, source, start, end, scale)
+                tasks.append(task)
+            parts = [task.result() for task in tasks]
+    return _scaled_to_decimal(*_merge_scaled(parts))
+
+
+def _decimal_to_scaled(amount: Decimal) -> tuple:
+    """Return *amount* as an exact ``(total, scale)`` pair."""
+    sign, digits, exponent = amount.as_tuple()
+    value = int("".join(map(str, digits)) or "0")
+    if exponent > 0:
+        value *= 10**exponent
+        exponent = 0
+    return (-value if sign else value), -exponent
+
+
+class ProfitAggregator:
+    """Exact running total of income values from text arriving in fragments.
+
+    Every fragment is appended to the unfinished tail of the previous one
+    and cut after its last separator character, so numbers split between
+    fragments are still found. Only the complete part is passed to *func*
+    (:func:`generator_numbers` by default); the total is kept as a scaled
+    integer and never loses precision.
+
+    Aggregators fed from different shards of the input can be combined
+    with :meth:`merge`.
+    """
+
+    def __init__(self, func: Callable = generator_numbers, scale: int = 2):
+        self.func = func
+        self.total = 0
+        self.scale = scale
+        self._carry = ""
+        self._snapshot = None
+
+    def _add(self, text: str) -> None:
+        """Add all numbers produced by *func* on *text* to the running total."""
+        parts = [(self.total, self.scale)]
+        parts.extend(_decimal_to_scaled(amount) for amount in self.func(text))
+        if len(parts) > 1:
+            self.total, self.scale = _merge_scaled(parts)
+            self._snapshot = None
+
+    def feed(self, fragment: str) -> None:
+        """Append a text fragment to the stream.
+
+        Args:
+            fragment: Next piece of the text, of any length.
+        """
+        head, self._carry = _split_complete(self._carry + fragment)
+        if head:
+            self._add(head)
+
+    def flush(self) -> None:
+        """Account for the unfinished tail, e.g. when the stream has ended."""
+        carry, self._carry = self._carry, ""
+        if carry:
+            self._add(carry)
+
+    def snapshot(self) -> Decimal:
+        """Return the total so far, rounded like :func:`sum_profit`.
+
+        The rounded value is cached until the total changes again.
+        Text after the last separator is not counted until :meth:`flush`.
+        """
+        if self._snapshot is None:
+            self._snapshot = _scaled_to_decimal(self.total, self.scale)
+        return self._snapshot
+
+    def merge(self, other: "ProfitAggregator") -> "ProfitAggregator":
+        """Add the total of *other* to this aggregator.
+
+        The unfinished tail of *other* belongs to its own stream and is not
+        carried over; call ``other.flush()`` first when that stream is over.
+
+        Returns:
+            ProfitAggregator: This aggregator, to allow chaining.
+        """
+        self.total, self.scale = _merge_scaled(
+            [(self.total, self.scale), (other.total, other.scale)]
+        )
+        self._snapshot = None
+        return self
+
+
 text = "Загальний дохід працівника складається з декількох частин: 1000.01 як основний дохід, доповнений додатковими надходженнями 27.45 і 324.00 доларів."
 total_income = sum_profit(text, generator_numbers)
 print(f"Загальний дохід: {total_income}")
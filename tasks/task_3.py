@@ -1,5 +1,23 @@
-from collections import Counter
+from array import array
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from functools import partial
+import bz2
+import csv
+import glob
+import gzip
+import hashlib
+import io
+import json
+import lzma
+import mmap
+import os
+import re
 import sys
+import tempfile
+import time
+import zlib
 from tabulate import tabulate
 
 # Could be replaced by automatic parsing if we 100% sure that log format stays the same
@@ -8,10 +26,103 @@ from tabulate import tabulate
 """Supported log levels, in display order."""
 LOG_LEVELS = ("INFO", "ERROR", "WARNING", "DEBUG")
 
+"""LOG_LEVELS encoded for scanning raw bytes."""
+LOG_LEVELS_BYTES = tuple(lvl.encode() for lvl in LOG_LEVELS)
+
+"""Level token lookups for the positional parser."""
+LEVEL_TOKENS = {lvl: lvl for lvl in LOG_LEVELS}
+LEVEL_TOKENS_BYTES = {lvl.encode(): lvl for lvl in LOG_LEVELS}
+
+"""Length of the leading "YYYY-MM-DD HH:MM:SS" timestamp."""
+TIMESTAMP_LENGTH = 19
+
+"""Leading timestamp of a log line, and the prefixes of it accepted by --from/--to."""
+TIMESTAMP_PATTERN = re.compile(rb"\d{4}-\d\d-\d\d \d\d:\d\d:\d\d")
+TIMESTAMP_PREFIX_PATTERN = re.compile(
+    r"\d{4}(-\d\d(-\d\d( \d\d(:\d\d(:\d\d)?)?)?)?)?"
+)
+
+"""Magic bytes of supported compressed logs and the modules opening them."""
+COMPRESSED_FORMATS = (
+    (b"\x1f\x8b", gzip),
+    (b"BZh", bz2),
+    (b"\xfd7zXZ\x00", lzma),
+)
+
+"""Size of the read buffer in front of a decompressor."""
+DECOMPRESS_BUFFER = 1 << 20
+
+"""Errors raised while reading a truncated or corrupt compressed log."""
+DECOMPRESS_ERRORS = (EOFError, gzip.BadGzipFile, lzma.LZMAError, zlib.error, OSError)
+
+"""Histogram bucket sizes, as the length of the timestamp prefix they keep."""
+HISTOGRAM_BUCKETS = {"minute": 16, "hour": 13}
+
+"""Default number of seconds between two table refreshes in --follow mode."""
+FOLLOW_INTERVAL = 2.0
+
+"""Maximum number of bytes --follow reads and counts at once."""
+FOLLOW_BLOCK = 1 << 20
+
+"""Number of filtered lines LineSink collects before writing them out."""
+OUTPUT_BATCH = 1024
+
+"""Characters str.strip() removes that are ASCII, for stripping raw bytes."""
+ASCII_WHITESPACE = b" \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f"
+
+"""Target number of bytes counted by one count_logs_parallel task."""
+RANGE_SIZE = 64 << 20
+
+"""Sidecar index file: name suffix, format marker and fingerprint window."""
+INDEX_SUFFIX = ".idx"
+INDEX_MAGIC = b"LOGIDX1\n"
+INDEX_FINGERPRINT_BYTES = 4096
+
+
+def compression_of(path):
+    """Return the module (gzip, bz2 or lzma) that decompresses *path*, or None.
+
+    The format is detected from the magic bytes, not the file name.
+    """
+    with open(path, "rb") as file:
+        magic = file.read(6)
+    for prefix, module in COMPRESSED_FORMATS:
+        if magic.startswith(prefix):
+            return module
+    return None
+
+
+def open_log(path):
+    """Open a plain or gzip/bz2/xz compressed log file as text.
+
+    Compressed files are decompressed on the fly through a large read
+    buffer, nothing is written to disk.
+    """
+    module = compression_of(path)
+    if module is None:
+        return open(path, "r")
+    raw = module.open(path, "rb")
+    return io.TextIOWrapper(io.BufferedReader(raw, DECOMPRESS_BUFFER))
+
+
+def _check_plain_log(path):
+    """Print why *path* can't be scanned as a plain log file; True if it can."""
+    if os.path.isdir(path):
+        print(f"Path {path} is a directory not a file")
+        return False
+    if not os.path.exists(path):
+        print(f"File not found: {path}")
+        return False
+    return True
+
 
 def row_generator(path):
     """Yield stripped lines from a file one at a time.
 
+    gzip, bz2 and xz compressed files are decompressed while reading. If
+    such a file turns out truncated or corrupt, the lines read so far are
+    kept and a message is printed instead of a traceback.
+
     Args:
         path: Path to the log file.
 
@@ -19,16 +130,178 @@ def row_generator(path):
         str: Each line with leading/trailing whitespace removed.
     """
     try:
-        with open(path, "r") as file:
+        with open_log(path) as file:
             for line in file:
                 yield line.strip()
     except IsADirectoryError:
         print(f"Path {path} is a directory not a file")
     except FileNotFoundError:
         print(f"File not found: {path}")
+    except DECOMPRESS_ERRORS as e:
+        print(f"Can't read {path}: {e}")
+
+
+def detect_level(line):
+    """Return the first of LOG_LEVELS found in *line*, case-insensitively.
+
+    Args:
+        line: A single log line.
+
+    Returns:
+        str | None: The detected log level, or None if there is none.
+    """
+    upper = line.upper()
+    return next((lvl for lvl in LOG_LEVELS if lvl in upper), None)
+
+
+def _level_token(line, space):
+    """Return the word right after the leading timestamp, or None.
+
+    Works on both ``str`` and ``bytes`` lines; *space* is ``" "`` or ``b" "``.
+    """
+    if line[10:11] != space:
+        return None
+    if line[TIMESTAMP_LENGTH : TIMESTAMP_LENGTH + 1] != space:
+        return None
+    end = line.find(space, TIMESTAMP_LENGTH + 1)
+    return line[TIMESTAMP_LENGTH + 1 : end if end != -1 else None]
+
+
+def parse_level(line):
+    """Return the log level of a "YYYY-MM-DD HH:MM:SS LEVEL message" line.
+
+    The level is read from its fixed position after the timestamp and
+    looked up in a dict, so words in the message body (e.g. "ERROR" in a
+    DEBUG line) do not affect the result. Lines in any other format fall
+    back to detect_level.
+
+    Args:
+        line: A single stripped log line.
+
+    Returns:
+        str | None: The log level, or None if there is none.
+    """
+    token = _level_token(line, " ")
+    if token:
+        level = LEVEL_TOKENS.get(token) or LEVEL_TOKENS.get(token.upper())
+        if level:
+            return level
+    return detect_level(line)
+
+
+def _parse_level_bytes(raw):
+    """Same as parse_level for a raw, unstripped line of bytes.
+
+    ``bytes.upper`` only knows ASCII, so lines with other characters are
+    decoded and handed to parse_level to get exactly the same result.
+    """
+    if not raw.isascii():
+        return parse_level(raw.decode("utf-8", "replace").strip())
+    line = raw.strip(ASCII_WHITESPACE)
+    token = _level_token(line, b" ")
+    if token:
+        level = LEVEL_TOKENS_BYTES.get(token)
+        level = level or LEVEL_TOKENS_BYTES.get(token.upper())
+        if level:
+            return level
+    upper = line.upper()
+    for lvl, lvl_bytes in zip(LOG_LEVELS, LOG_LEVELS_BYTES):
+        if lvl_bytes in upper:
+            return lvl
+    return None
+
+
+class LineSink:
+    """Callable that writes lines to a text stream in buffered batches.
+
+    Pass it as the ``sink`` of count_logs to print matching lines as they
+    are found instead of collecting them all in memory first.
+
+    Args:
+        stream: Text stream to write to. Defaults to the current sys.stdout.
+        batch_size: Number of lines buffered before a single write.
+    """
+
+    def __init__(self, stream=None, batch_size=OUTPUT_BATCH):
+        self.stream = stream
+        self.batch_size = batch_size
+        self.written = 0
+        self._buffer = []
+
+    def __call__(self, line):
+        self._buffer.append(line)
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Write out the buffered lines."""
+        if not self._buffer:
+            return
+        stream = self.stream or sys.stdout
+        stream.write("\n".join(self._buffer) + "\n")
+        stream.flush()
+        self.written += len(self._buffer)
+        self._buffer.clear()
+
 
+class LevelHistogram:
+    """Counts of each log level per minute or hour of the line timestamps.
 
-def count_logs(argv, level_filter=None):
+    Buckets are keyed by a prefix of the "YYYY-MM-DD HH:MM:SS" timestamp
+    ("2024-01-22 09:00" for minutes, "2024-01-22 09" for hours). Each
+    bucket is a position in one ``array('L')`` per level, so memory grows
+    with the number of buckets, not with the number of lines. Lines without
+    a leading timestamp are not bucketed.
+
+    Args:
+        bucket: One of HISTOGRAM_BUCKETS.
+    """
+
+    def __init__(self, bucket="minute"):
+        if bucket not in HISTOGRAM_BUCKETS:
+            raise ValueError(
+                f"Unknown bucket: {bucket}. "
+                f"Valid buckets: {', '.join(HISTOGRAM_BUCKETS)}"
+            )
+        self.bucket = bucket
+        self.width = HISTOGRAM_BUCKETS[bucket]
+        self.keys = []
+        self.counts = {lvl: array("L") for lvl in LOG_LEVELS}
+        self._positions = {}
+
+    def add(self, line, level):
+        """Count one line of *level*, bucketed by its leading timestamp."""
+        if line[4:5] != "-" or line[10:11] != " ":
+            return
+        key = line[: self.width]
+        position = self._positions.get(key)
+        if position is None:
+            position = self._positions[key] = len(self.keys)
+            self.keys.append(key)
+            for counts in self.counts.values():
+                counts.append(0)
+        self.counts[level][position] += 1
+
+    def rows(self):
+        """Return ``[bucket, count per level...]`` rows in time order."""
+        return [
+            [key, *(self.counts[lvl][self._positions[key]] for lvl in LOG_LEVELS)]
+            for key in sorted(self.keys)
+        ]
+
+    def print_table(self):
+        """Print the histogram as a table."""
+        headers = [self.bucket.upper(), *LOG_LEVELS]
+        print(tabulate(self.rows(), headers=headers, tablefmt="grid"))
+
+    def write_csv(self, stream=None):
+        """Write the histogram as CSV to *stream* (sys.stdout by default)."""
+        writer = csv.writer(stream or sys.stdout)
+        writer.writerow([self.bucket, *LOG_LEVELS])
+        writer.writerows(self.rows())
+
+
+def count_logs(argv, level_filter=None, sink=None, histogram=None):
     """Parse the log file and count entries per level.
 
     Reads the file lazily via row_generator. Only stores full lines
@@ -38,33 +311,815 @@ def count_logs(argv, level_filter=None):
         argv: Argument list where argv[1] is the path to the log file.
         level_filter: Optional uppercase log level (e.g. "ERROR") whose
             lines should be collected. If None, no lines are stored.
+        sink: Optional callable receiving each line of level_filter as soon
+            as it is found (e.g. a LineSink). Lines passed to the sink are
+            not stored.
+        histogram: Optional LevelHistogram filled in the same pass.
 
     Returns:
         tuple[Counter, list[str]]: A counter of occurrences per level
-            and a list of lines matching level_filter (empty if None).
+            and a list of lines matching level_filter (empty if None
+            or if a sink is given).
     """
     counts = Counter()
     filtered_lines = []
+    emit = sink or filtered_lines.append
 
     for line in row_generator(argv[1]):
-        level = next((lvl for lvl in LOG_LEVELS if lvl in line.upper()), None)
+        level = parse_level(line)
         if level:
             counts[level] += 1
+            if histogram is not None:
+                histogram.add(line, level)
             if level == level_filter:
-                filtered_lines.append(line)
+                emit(line)
+
+    return counts, filtered_lines
+
+
+def _count_range(path, start, end, level_filter=None, histogram=None):
+    """Worker: count log levels in bytes ``[start, end)`` of a memory-mapped file.
+
+    Lines are split the same way as a file opened in text mode
+    (``\\n``, ``\\r`` and ``\\r\\n``), and only lines of *level_filter* are
+    decoded. If a LevelHistogram is given (in-process calls only), it gets
+    the decoded timestamp prefix of every line.
+
+    Returns:
+        tuple[Counter, list[str]]: Same as count_logs, for this range only.
+    """
+    counts = Counter()
+    filtered_lines = []
+    with open(path, "rb") as file, mmap.mmap(
+        file.fileno(), 0, access=mmap.ACCESS_READ
+    ) as mapped:
+        for raw in mapped[start:end].splitlines():
+            level = _parse_level_bytes(raw)
+            if level:
+                counts[level] += 1
+                if histogram is not None:
+                    prefix = raw[: histogram.width].decode("utf-8", "replace")
+                    histogram.add(prefix, level)
+                if level == level_filter:
+                    filtered_lines.append(raw.decode("utf-8", "replace").strip())
+    return counts, filtered_lines
+
+
+def _line_ranges(path, size, parts):
+    """Split a file of *size* bytes into up to *parts* newline-aligned ranges."""
+    bounds = [0]
+    with open(path, "rb") as file, mmap.mmap(
+        file.fileno(), 0, access=mmap.ACCESS_READ
+    ) as mapped:
+        for i in range(1, parts):
+            offset = max(size * i // parts, bounds[-1])
+            newline = mapped.find(b"\n", offset)
+            bounds.append(size if newline == -1 else newline + 1)
+    bounds.append(size)
+    return [(start, end) for start, end in zip(bounds, bounds[1:]) if start < end]
+
+
+def count_logs_parallel(
+    argv, level_filter=None, workers=None, range_size=RANGE_SIZE, sink=None
+):
+    """Multi-process version of count_logs for large log files.
+
+    The file is memory-mapped and split into newline-aligned byte ranges of
+    about *range_size* bytes. Worker processes count levels on raw bytes
+    and their Counters are merged at the end, so the result is exactly the
+    one count_logs returns.
+
+    Args:
+        argv: Argument list where argv[1] is the path to the log file.
+        level_filter: Same as in count_logs.
+        workers: Number of worker processes (defaults to the CPU count).
+        range_size: Target number of bytes per task. Files no larger than
+            this are counted in this process.
+        sink: Same as in count_logs. Lines are passed on range by range, in
+            file order, as soon as each range is done.
+
+    Returns:
+        tuple[Counter, list[str]]: Same as count_logs.
+    """
+    path = argv[1]
+    counts = Counter()
+    filtered_lines = []
+    emit = sink or filtered_lines.append
+    if not _check_plain_log(path):
+        return counts, filtered_lines
+    if compression_of(path):
+        # a compressed stream can't be split, count it in one go
+        return count_logs(argv, level_filter, sink)
+
+    size = os.path.getsize(path)
+    if size <= range_size:
+        # a single range of work doesn't pay for starting a process pool
+        return count_logs(argv, level_filter, sink)
+    workers = workers or os.cpu_count() or 1
+    ranges = _line_ranges(path, size, max(workers, -(-size // range_size)))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        tasks = [
+            pool.submit(_count_range, path, start, end, level_filter)
+            for start, end in ranges
+        ]
+        for task in tasks:
+            range_counts, range_lines = task.result()
+            counts.update(range_counts)
+            for line in range_lines:
+                emit(line)
+    return counts, filtered_lines
+
+
+class LogFollower:
+    """Keep level counts of a growing log file up to date, like ``tail -f``.
+
+    Each poll reads only the bytes appended since the previous one and
+    counts the complete lines among them; an unfinished last line waits for
+    the next poll. The file stays open between polls, so when it is rotated
+    (the path now points to a new file) the rest of the old file is read
+    first, then counting continues from the start of the new one. A file
+    truncated in place is read again from the beginning. Counts are never
+    reset. New data is read in blocks of block_size bytes, so memory stays
+    bounded even when a poll has gigabytes to catch up on.
+
+    Args:
+        path: Path to the log file.
+        level_filter: Optional log level whose new lines are passed to sink.
+        sink: Optional callable receiving each new line of level_filter.
+        block_size: Maximum number of bytes read and counted at once.
+    """
+
+    def __init__(self, path, level_filter=None, sink=None, block_size=FOLLOW_BLOCK):
+        self.path = path
+        self.level_filter = level_filter
+        self.sink = sink
+        self.block_size = block_size
+        self.counts = Counter()
+        self.offset = 0
+        self._file = None
+        self._partial = b""
+
+    def _count(self, data):
+        """Count the lines in *data* and return how many were counted."""
+        lines = data.splitlines()
+        for raw in lines:
+            level = _parse_level_bytes(raw)
+            if level:
+                self.counts[level] += 1
+                if level == self.level_filter and self.sink:
+                    self.sink(raw.decode("utf-8", "replace").strip())
+        return len(lines)
+
+    def _read_available(self):
+        """Count the complete lines appended to the open file since the last read."""
+        counted = 0
+        while True:
+            data = self._file.read(self.block_size)
+            if not data:
+                return counted
+            self.offset += len(data)
+            data = self._partial + data
+            end = data.rfind(b"\n") + 1
+            self._partial = data[end:]
+            counted += self._count(data[:end])
+
+    def _switch_to_current_file(self):
+        """Finish the open file and start over with the one now at path."""
+        counted = self._count(self._partial) if self._partial else 0
+        self.close()
+        self._partial = b""
+        self.offset = 0
+        try:
+            self._file = open(self.path, "rb")
+        except FileNotFoundError:
+            return counted
+        return counted + self._read_available()
+
+    def poll(self):
+        """Read what was appended since the previous poll.
+
+        Returns:
+            int: Number of new lines read.
+        """
+        if self._file is None:
+            return self._switch_to_current_file()
+
+        counted = self._read_available()
+        try:
+            current = os.stat(self.path)
+        except FileNotFoundError:
+            return counted  # rotated, the new file is not created yet
+        opened = os.fstat(self._file.fileno())
+        if (current.st_dev, current.st_ino) != (opened.st_dev, opened.st_ino):
+            return counted + self._switch_to_current_file()
+        if current.st_size < self.offset:
+            self._file.seek(0)
+            self.offset = 0
+            self._partial = b""
+            counted += self._read_available()
+        return counted
+
+    def close(self):
+        """Close the followed file."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def follow_logs(path, level_filter=None, interval=FOLLOW_INTERVAL, iterations=None):
+    """Follow a log file and reprint the counts table every *interval* seconds.
+
+    New lines of level_filter are printed as soon as they are read.
+
+    Args:
+        path: Path to the log file.
+        level_filter: Optional log level whose new lines are printed.
+        interval: Seconds between two polls.
+        iterations: Stop after this many polls; follow forever if None.
+
+    Returns:
+        Counter: The counts at the time following stopped.
+    """
+    sink = LineSink() if level_filter else None
+    follower = LogFollower(path, level_filter, sink)
+    polls = 0
+    try:
+        while iterations is None or polls < iterations:
+            if polls:
+                time.sleep(interval)
+            follower.poll()
+            polls += 1
+            if sink:
+                sink.flush()
+            if follower.counts:
+                print_counts(follower.counts)
+    finally:
+        follower.close()
+    return follower.counts
+
 
+class LogIndex:
+    """Per-level line offsets of a log file, kept in a sidecar file.
+
+    For every level in LOG_LEVELS the index holds an ``array('Q')`` with the
+    byte offset of each line of that level, so counts are array lengths and
+    filtered lines are a seek away. Only complete lines, up to the last
+    newline, are indexed; an unfinished last line is scanned on each query.
+
+    The index remembers the size and mtime of the file it was built for,
+    plus a fingerprint of the bytes right before the indexed end. A file
+    that is unchanged is answered from the index alone; a file that only
+    grew is indexed from where the previous scan stopped; anything else is
+    indexed again from scratch.
+
+    File layout: INDEX_MAGIC, one JSON header line, then the raw offset
+    arrays in LOG_LEVELS order (native byte order).
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.index_path = f"{path}{INDEX_SUFFIX}"
+        self.file_size = 0
+        self.mtime_ns = 0
+        self.indexed = 0
+        self.fingerprint = ""
+        self.offsets = {lvl: array("Q") for lvl in LOG_LEVELS}
+
+    def _fingerprint(self, file, end):
+        """Return a hash of the bytes right before *end* in *file*."""
+        start = max(0, end - INDEX_FINGERPRINT_BYTES)
+        file.seek(start)
+        return hashlib.blake2b(file.read(end - start), digest_size=16).hexdigest()
+
+    def load(self):
+        """Read the sidecar file. Returns False if it is missing or unreadable."""
+        try:
+            with open(self.index_path, "rb") as file:
+                if file.readline() != INDEX_MAGIC:
+                    return False
+                header = json.loads(file.readline())
+                offsets = {}
+                for lvl in LOG_LEVELS:
+                    offsets[lvl] = array("Q")
+                    offsets[lvl].fromfile(file, header["counts"][lvl])
+        except (OSError, ValueError, KeyError, EOFError):
+            return False
+        self.file_size = header["file_size"]
+        self.mtime_ns = header["mtime_ns"]
+        self.indexed = header["indexed"]
+        self.fingerprint = header["fingerprint"]
+        self.offsets = offsets
+        return True
+
+    def save(self):
+        """Write the sidecar file atomically. Returns False if that failed."""
+        header = {
+            "file_size": self.file_size,
+            "mtime_ns": self.mtime_ns,
+            "indexed": self.indexed,
+            "fingerprint": self.fingerprint,
+            "counts": {lvl: len(self.offsets[lvl]) for lvl in LOG_LEVELS},
+        }
+        tmp_path = f"{self.index_path}.tmp"
+        try:
+            with open(tmp_path, "wb") as file:
+                file.write(INDEX_MAGIC)
+                file.write(json.dumps(header).encode() + b"\n")
+                for lvl in LOG_LEVELS:
+                    self.offsets[lvl].tofile(file)
+            os.replace(tmp_path, self.index_path)
+        except OSError:
+            return False
+        return True
+
+    def update(self):
+        """Bring the index up to date with the log file.
+
+        Returns:
+            bool: True if the index changed and should be saved.
+        """
+        stat = os.stat(self.path)
+        if (stat.st_size, stat.st_mtime_ns) == (self.file_size, self.mtime_ns):
+            return False
+        with open(self.path, "rb") as file:
+            grown = stat.st_size >= self.indexed and (
+                self._fingerprint(file, self.indexed) == self.fingerprint
+            )
+            if not grown:
+                self.offsets = {lvl: array("Q") for lvl in LOG_LEVELS}
+                self.indexed = 0
+            file.seek(self.indexed)
+            offset = self.indexed
+            for raw in file:
+                if not raw.endswith(b"\n"):
+                    break
+                for piece in raw.splitlines(keepends=True):
+                    level = _parse_level_bytes(piece)
+                    if level:
+                        self.offsets[level].append(offset)
+                    offset += len(piece)
+            self.indexed = offset
+            self.fingerprint = self._fingerprint(file, offset)
+        self.file_size = stat.st_size
+        self.mtime_ns = stat.st_mtime_ns
+        return True
+
+    def _tail(self):
+        """Return the unindexed lines after the last newline, as raw bytes."""
+        with open(self.path, "rb") as file:
+            file.seek(self.indexed)
+            return file.read().splitlines()
+
+    def counts(self):
+        """Return a Counter of lines per level, same as count_logs."""
+        counts = Counter(
+            {lvl: len(self.offsets[lvl]) for lvl in LOG_LEVELS if self.offsets[lvl]}
+        )
+        for raw in self._tail():
+            level = _parse_level_bytes(raw)
+            if level:
+                counts[level] += 1
+        return counts
+
+    def lines(self, level):
+        """Yield the stripped lines of *level* in file order."""
+        if self.offsets.get(level):
+            with open(self.path, "rb") as file, mmap.mmap(
+                file.fileno(), 0, access=mmap.ACCESS_READ
+            ) as mapped:
+                for offset in self.offsets[level]:
+                    end = mapped.find(b"\n", offset, self.indexed)
+                    raw = mapped[offset : end if end != -1 else self.indexed]
+                    first = raw.splitlines()[0] if raw else b""
+                    yield first.decode("utf-8", "replace").strip()
+        for raw in self._tail():
+            if _parse_level_bytes(raw) == level:
+                yield raw.decode("utf-8", "replace").strip()
+
+
+def count_logs_indexed(argv, level_filter=None, sink=None):
+    """Same as count_logs, answered from a sidecar index next to the log.
+
+    The first call scans the whole file and writes ``<log>.idx``; later
+    calls only scan what was appended since, if anything.
+
+    Args:
+        argv: Argument list where argv[1] is the path to the log file.
+        level_filter: Same as in count_logs.
+        sink: Same as in count_logs.
+
+    Returns:
+        tuple[Counter, list[str]]: Same as count_logs.
+    """
+    path = argv[1]
+    filtered_lines = []
+    if not _check_plain_log(path):
+        return Counter(), filtered_lines
+    if compression_of(path):
+        # rotated compressed logs don't grow, there is nothing to index
+        return count_logs(argv, level_filter, sink)
+
+    index = LogIndex(path)
+    index.load()
+    if index.update():
+        index.save()
+    if level_filter:
+        emit = sink or filtered_lines.append
+        for line in index.lines(level_filter):
+            emit(line)
+    return index.counts(), filtered_lines
+
+
+def _next_timestamped_line(mapped, pos):
+    """Return ``(offset, timestamp)`` of the first timestamped line at or after *pos*.
+
+    *pos* may point anywhere inside a line; the search starts at the next
+    line start. Returns ``(len(mapped), None)`` if there is no such line.
+    """
+    size = len(mapped)
+    if pos:
+        newline = mapped.find(b"\n", pos - 1)
+        pos = size if newline == -1 else newline + 1
+    while pos < size:
+        match = TIMESTAMP_PATTERN.match(mapped, pos)
+        if match:
+            return pos, match.group()
+        newline = mapped.find(b"\n", pos)
+        pos = size if newline == -1 else newline + 1
+    return size, None
+
+
+def _bisect_log(mapped, is_after):
+    """Return the offset of the first timestamped line for which *is_after* holds.
+
+    Binary search over byte positions, so the file must be sorted by its
+    leading timestamps. Lines without a timestamp stay with the entry above.
+    """
+    lo, hi = 0, len(mapped)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        _, timestamp = _next_timestamped_line(mapped, mid)
+        if timestamp is None or is_after(timestamp):
+            hi = mid
+        else:
+            lo = mid + 1
+    return _next_timestamped_line(mapped, lo)[0]
+
+
+def _validate_timestamp(value):
+    """Return *value* as bytes, raising ValueError if it is no timestamp prefix."""
+    if not TIMESTAMP_PREFIX_PATTERN.fullmatch(value):
+        raise ValueError(
+            f"Invalid timestamp: {value}. Expected a prefix of YYYY-MM-DD HH:MM:SS."
+        )
+    return value.encode()
+
+
+def find_time_range(path, start=None, end=None):
+    """Return the byte range of log entries between two timestamps.
+
+    Args:
+        path: Path to a log file sorted by its leading timestamps.
+        start: Timestamp or prefix of one, e.g. "2024-01-22 09". Entries at
+            or after it are included. None means from the beginning.
+        end: Same as *start*; entries up to and including it (compared on
+            the given prefix) are included. None means up to the end.
+
+    Returns:
+        tuple[int, int]: ``(start, end)`` byte offsets, found in O(log size).
+
+    Raises:
+        ValueError: If *start* or *end* is not a timestamp prefix.
+    """
+    start = _validate_timestamp(start) if start else None
+    end = _validate_timestamp(end) if end else None
+    size = os.path.getsize(path)
+    if size == 0:
+        return 0, 0
+    with open(path, "rb") as file, mmap.mmap(
+        file.fileno(), 0, access=mmap.ACCESS_READ
+    ) as mapped:
+        first = _bisect_log(mapped, lambda ts: ts >= start) if start else 0
+        last = _bisect_log(mapped, lambda ts: ts[: len(end)] > end) if end else size
+    return first, max(first, last)
+
+
+def count_logs_between(
+    argv, level_filter=None, sink=None, start=None, end=None, histogram=None
+):
+    """Same as count_logs, for the entries between two timestamps only.
+
+    The window is located by binary search (see find_time_range) and only
+    its bytes are read, so the cost is O(log size + window).
+
+    Args:
+        argv: Argument list where argv[1] is the path to the log file.
+        level_filter: Same as in count_logs.
+        sink: Same as in count_logs.
+        start: Same as in find_time_range.
+        end: Same as in find_time_range.
+        histogram: Same as in count_logs, filled from the window only.
+
+    Returns:
+        tuple[Counter, list[str]]: Same as count_logs.
+
+    Raises:
+        ValueError: If *start* or *end* is not a timestamp prefix.
+    """
+    path = argv[1]
+    if not _check_plain_log(path):
+        return Counter(), []
+    if compression_of(path):
+        print(f"Time range queries need a plain log file: {path} is compressed")
+        return Counter(), []
+
+    first, last = find_time_range(path, start, end)
+    if first == last:
+        return Counter(), []
+    counts, filtered_lines = _count_range(path, first, last, level_filter, histogram)
+    if sink:
+        for line in filtered_lines:
+            sink(line)
+        filtered_lines = []
     return counts, filtered_lines
 
 
+def _count_file(path, level_filter=None):
+    """Worker: count_logs for a single, possibly compressed, file.
+
+    Lines of level_filter are written to a temporary file instead of being
+    returned, so a file with millions of them is never held in memory.
+    Messages row_generator prints about the file (e.g. a truncated archive)
+    are captured and returned, so the parent can report them.
+
+    Returns:
+        tuple[Counter, str | None, str]: The counts, the path of the
+            temporary file with the filtered lines (None without
+            level_filter) and the printed messages.
+    """
+    messages = io.StringIO()
+    if not level_filter:
+        with redirect_stdout(messages):
+            counts, _ = count_logs(["", path])
+        return counts, None, messages.getvalue()
+    with tempfile.NamedTemporaryFile(
+        "w", encoding="utf-8", newline="\n", suffix=".lines", delete=False
+    ) as out:
+        try:
+            with redirect_stdout(messages):
+                counts, _ = count_logs(
+                    ["", path], level_filter, sink=lambda line: out.write(line + "\n")
+                )
+        except BaseException:
+            out.close()
+            os.remove(out.name)
+            raise
+    return counts, out.name, messages.getvalue()
+
+
+def _read_lines(lines_path):
+    """Yield the lines a _count_file worker wrote to *lines_path*."""
+    if lines_path is None:
+        return
+    with open(lines_path, encoding="utf-8", newline="\n") as file:
+        for line in file:
+            yield line[:-1]
+
+
+def _hand_over(path, task):
+    """Yield the result of a _count_file task, deleting its lines file after.
+
+    A file that could not be read, fully or in part, is reported on stderr;
+    if its worker failed, it is yielded with empty counts.
+    """
+    try:
+        counts, lines_path, messages = task.result()
+    except Exception as e:
+        counts, lines_path, messages = Counter(), None, f"Can't read {path}: {e}"
+    if messages:
+        print(messages.rstrip("\n"), file=sys.stderr)
+    lines = _read_lines(lines_path)
+    try:
+        yield path, counts, lines
+    finally:
+        lines.close()
+        if lines_path:
+            os.remove(lines_path)
+
+
+def iter_count_logs(paths, level_filter=None, workers=None):
+    """Count several log files at once, one worker process per file.
+
+    Decompressing gzip/bz2/xz files is CPU bound, so running it in separate
+    processes scales with the number of cores. At most two files per
+    worker are in flight at any time, and workers pass the lines of
+    level_filter through temporary files that are read back lazily, so
+    memory stays bounded however many files and lines there are. A file
+    that can't be read is reported on stderr and the others are still
+    counted.
+
+    Args:
+        paths: Paths to plain or compressed log files.
+        level_filter: Same as in count_logs.
+        workers: Number of worker processes (defaults to the CPU count).
+
+    Yields:
+        tuple[str, Counter, Iterator[str]]: The path, its counts and its
+            lines of level_filter, in the order of *paths*. The lines must
+            be read before the next item is requested.
+    """
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        try:
+            for path in paths:
+                pending.append((path, pool.submit(_count_file, path, level_filter)))
+                if len(pending) >= 2 * workers:
+                    yield from _hand_over(*pending.popleft())
+            while pending:
+                yield from _hand_over(*pending.popleft())
+        finally:
+            for _, task in pending:
+                if not task.cancel() and task.exception() is None:
+                    _, lines_path, _ = task.result()
+                    if lines_path:
+                        os.remove(lines_path)
+
+
+def count_logs_many(paths, level_filter=None, workers=None):
+    """Collect the results of iter_count_logs into a dict.
+
+    Returns:
+        dict[str, tuple[Counter, list[str]]]: count_logs results per path,
+            in the order of *paths*.
+    """
+    return {
+        path: (counts, list(lines))
+        for path, counts, lines in iter_count_logs(paths, level_filter, workers)
+    }
+
+
+def expand_log_paths(target):
+    """Return the log files a command-line target refers to.
+
+    Args:
+        target: A file, a directory (its files, without sidecar indexes) or
+            a glob pattern such as "logs/app.log*".
+
+    Returns:
+        list[str]: Sorted file paths; empty if nothing matches.
+    """
+    if os.path.isdir(target):
+        paths = (os.path.join(target, name) for name in os.listdir(target))
+        paths = (path for path in paths if not path.endswith(INDEX_SUFFIX))
+    elif any(char in target for char in "*?["):
+        paths = glob.glob(target)
+    else:
+        return [target]
+    return sorted(path for path in paths if os.path.isfile(path))
+
+
+def count_log_files(paths, level_filter=None, sink=None, workers=None):
+    """Count many log files and merge their counters.
+
+    Only the counters are kept; lines of level_filter go to *sink* file by
+    file. Progress is reported on stderr as files are finished.
+
+    Args:
+        paths: Paths to plain or compressed log files.
+        level_filter: Same as in count_logs.
+        sink: Optional callable receiving lines of level_filter.
+        workers: Same as in iter_count_logs.
+
+    Returns:
+        tuple[dict[str, Counter], Counter]: Counts per file and in total.
+    """
+    per_file = {}
+    total = Counter()
+    for done, (path, counts, lines) in enumerate(
+        iter_count_logs(paths, level_filter, workers), start=1
+    ):
+        print(f"[{done}/{len(paths)}] {path}", file=sys.stderr)
+        per_file[path] = counts
+        total.update(counts)
+        if sink:
+            for line in lines:
+                sink(line)
+    return per_file, total
+
+
+def _pop_option(argv, option, default=None):
+    """Return the value following *option* in *argv*, and *argv* without both."""
+    if option not in argv:
+        return default, argv
+    index = argv.index(option)
+    if index + 1 >= len(argv):
+        raise ValueError(f"Option {option} requires a value.")
+    return argv[index + 1], argv[:index] + argv[index + 2 :]
+
+
+def _pop_flag(argv, flag):
+    """Return whether *flag* is in *argv*, and *argv* without it."""
+    return flag in argv, [arg for arg in argv if arg != flag]
+
+
+def print_counts(counts):
+    """Print the per-level counts as a table, in LOG_LEVELS order."""
+    table = [[lvl, counts[lvl]] for lvl in LOG_LEVELS if lvl in counts]
+    print("\n")
+    print(tabulate(table, headers=["LOG LEVEL", "RECORDS COUNT"], tablefmt="grid"), "\n")
+
+
+def print_file_counts(per_file, total):
+    """Print a table of counts per file followed by the total counts table."""
+    rows = [
+        [path, *(counts[lvl] for lvl in LOG_LEVELS)]
+        for path, counts in per_file.items()
+    ]
+    print("\n")
+    print(tabulate(rows, headers=["FILE", *LOG_LEVELS], tablefmt="grid"))
+    if total:
+        print_counts(total)
+
+
 def main(argv):
     """Entry point: validate arguments, parse the log file, and print results.
 
     Usage:
-        python task_3.py <path_to_log_file> [log_level]
+        python task_3.py <path_to_log_file> [log_level] [--parallel] [--stream]
+        python task_3.py <path_to_log_file> [log_level] [--index] [--stream]
+        python task_3.py <path_to_log_file> [log_level] [--from TS] [--to TS]
+        python task_3.py <path_to_log_file> [log_level] --follow [--interval SECONDS]
+        python task_3.py <path_to_log_file> [log_level] --histogram minute|hour [--csv]
+        python task_3.py <log_directory | "glob*"> [log_level]
+
+    A directory or glob pattern counts all matching (possibly compressed)
+    files in parallel and prints a table per file plus a total table.
+    Records of log_level are always streamed there, so --stream and
+    --parallel change nothing; the other options are rejected.
+
+    Options:
+        --parallel  Count the file with count_logs_parallel on all CPU cores.
+        --index     Answer from a <path_to_log_file>.idx sidecar index,
+                    creating or extending it as needed.
+        --stream    Print records of log_level while the file is scanned
+                    and the counts table at the end.
+        --from TS   Only count entries at or after timestamp TS, e.g.
+                    "2024-01-22 09:00". The log must be sorted by time.
+        --to TS     Only count entries up to and including TS.
+        --histogram minute|hour
+                    Also print counts per minute or hour of the timestamps,
+                    gathered in the same pass (uses the plain serial scan,
+                    or the --from/--to window).
+        --csv       Print the histogram as CSV instead of a table.
+        --follow    Keep reading lines appended to the file and reprint the
+                    table every --interval seconds (2 by default).
+
+    --follow, --parallel, --index, --from/--to and --histogram pick how the
+    file is counted, so only --from/--to and --histogram can be combined.
 
     Args:
         argv: Command-line arguments (sys.argv).
     """
+    parallel, argv = _pop_flag(argv, "--parallel")
+    indexed, argv = _pop_flag(argv, "--index")
+    stream, argv = _pop_flag(argv, "--stream")
+    follow, argv = _pop_flag(argv, "--follow")
+    as_csv, argv = _pop_flag(argv, "--csv")
+    try:
+        interval, argv = _pop_option(argv, "--interval", FOLLOW_INTERVAL)
+        time_from, argv = _pop_option(argv, "--from")
+        time_to, argv = _pop_option(argv, "--to")
+        bucket, argv = _pop_option(argv, "--histogram")
+        histogram = LevelHistogram(bucket) if bucket else None
+        for value in (time_from, time_to):
+            if value:
+                _validate_timestamp(value)
+    except ValueError as e:
+        print(e.args[0])
+        return
+    modes = [
+        option
+        for option, used in (
+            ("--follow", follow),
+            ("--parallel", parallel),
+            ("--index", indexed),
+            ("--from/--to", time_from or time_to),
+            ("--histogram", bucket),
+        )
+        if used
+    ]
+    if len(modes) > 1 and modes != ["--from/--to", "--histogram"]:
+        print(f"Options {', '.join(modes)} can't be used together.")
+        return
+    if as_csv and not bucket:
+        print("Option --csv needs --histogram.")
+        return
+    try:
+        interval = float(interval)
+    except ValueError:
+        print(f"Invalid interval: {interval}")
+        return
     if len(argv) < 2:
         print("Path to log file is not specified.")
         return
@@ -75,17 +1130,72 @@ def main(argv):
         if level_filter not in LOG_LEVELS:
             print(f"Unknown log level: {level_filter}. Valid levels: {', '.join(LOG_LEVELS)}")
 
-    counts, filtered_lines = count_logs(argv, level_filter)
-    if counts:
-        table = [[lvl, counts[lvl]] for lvl in LOG_LEVELS if lvl in counts]
-        print("\n")
-        print(tabulate(table, headers=["LOG LEVEL", "RECORDS COUNT"], tablefmt="grid"), "\n")
-    if level_filter:
-        if filtered_lines:
+    paths = expand_log_paths(argv[1])
+    if not paths:
+        print(f"No log files match: {argv[1]}")
+        return
+    if len(paths) > 1 or paths[0] != argv[1]:
+        unsupported = [option for option in modes if option != "--parallel"]
+        if unsupported:
+            print(
+                f"Options {', '.join(unsupported)} can't be used with a directory "
+                "or glob pattern."
+            )
+            return
+        sink = None
+        if level_filter:
             print(f"\nRecords with log level {level_filter}:\n")
-            print("\n".join(filtered_lines))
-        else:
+            sink = LineSink()
+        per_file, total = count_log_files(paths, level_filter, sink)
+        if sink:
+            sink.flush()
+        print_file_counts(per_file, total)
+        return
+
+    if follow:
+        try:
+            follow_logs(argv[1], level_filter, interval)
+        except KeyboardInterrupt:
+            pass
+        return
+
+    counter = count_logs
+    if time_from or time_to:
+        counter = partial(
+            count_logs_between, start=time_from, end=time_to, histogram=histogram
+        )
+    elif histogram:
+        counter = partial(count_logs, histogram=histogram)
+    elif parallel:
+        counter = count_logs_parallel
+    elif indexed:
+        counter = count_logs_indexed
+    if stream and level_filter:
+        print(f"\nRecords with log level {level_filter}:\n")
+        sink = LineSink()
+        counts, _ = counter(argv, level_filter, sink=sink)
+        sink.flush()
+        if not sink.written:
             print(f"\nThere is no records with {level_filter} log level\n")
+        if counts:
+            print_counts(counts)
+    else:
+        counts, filtered_lines = counter(argv, level_filter)
+        if counts:
+            print_counts(counts)
+        if level_filter:
+            if filtered_lines:
+                print(f"\nRecords with log level {level_filter}:\n")
+                print("\n".join(filtered_lines))
+            else:
+                print(f"\nThere is no records with {level_filter} log level\n")
+
+    if histogram and histogram.keys:
+        if as_csv:
+            histogram.write_csv()
+        else:
+            print(f"\nRecords per {histogram.bucket}:\n")
+            histogram.print_table()
 
 
 if __name__ == "__main__":
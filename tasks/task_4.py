@@ -2,10 +2,16 @@
 Contact Management Bot
 
 A simple command-line bot for managing contacts with phone numbers.
-Supports adding, updating, retrieving, and listing contacts with validation.
+Supports adding, updating, retrieving, searching, listing, importing and
+exporting contacts with validation.
 """
 
-import re
+from bisect import bisect_left
+from itertools import chain, islice
+import csv
+import json
+import os
+import sys
 from colorama import Fore, Style
 from tabulate import tabulate
 
@@ -19,7 +25,11 @@ COMMANDS_HELP_INFO = {
     "add": f"{HELP_MAIN_TEXT}{BOT_COLOR}'add <username> <phone number>' {HELP_MAIN_TEXT}to add user with it's phone.'{Style.RESET_ALL}",
     "change": f"{HELP_MAIN_TEXT}{BOT_COLOR}'change <username> <phone number>' {HELP_MAIN_TEXT}to update username's phone.'{Style.RESET_ALL}",
     "phone": f"{HELP_MAIN_TEXT}{BOT_COLOR}'phone <username>' {HELP_MAIN_TEXT}to get phone of the user.{Style.RESET_ALL}",
-    "all": f"{HELP_MAIN_TEXT}{BOT_COLOR}'all' {HELP_MAIN_TEXT}to get get list of all users and their phones{Style.RESET_ALL}",
+    "who": f"{HELP_MAIN_TEXT}{BOT_COLOR}'who <phone>' {HELP_MAIN_TEXT}to find the user a phone number belongs to.{Style.RESET_ALL}",
+    "search": f"{HELP_MAIN_TEXT}{BOT_COLOR}'search <name prefix> [page]' {HELP_MAIN_TEXT}to find users by the start of their name, or by a name with a typo.{Style.RESET_ALL}",
+    "import": f"{HELP_MAIN_TEXT}{BOT_COLOR}'import <file.csv>' {HELP_MAIN_TEXT}to add or update users from a 'name,phone' CSV file.{Style.RESET_ALL}",
+    "export": f"{HELP_MAIN_TEXT}{BOT_COLOR}'export <file.csv>' {HELP_MAIN_TEXT}to save all users to a CSV file.{Style.RESET_ALL}",
+    "all": f"{HELP_MAIN_TEXT}{BOT_COLOR}'all [--page N] [--size K] [--csv]' {HELP_MAIN_TEXT}to get get list of all users and their phones, page by page or as CSV{Style.RESET_ALL}",
     "exit or close": f"{HELP_MAIN_TEXT}{BOT_COLOR}'close' or 'exit' {HELP_MAIN_TEXT} to stop the assistant.{Style.RESET_ALL}",
 }
 
@@ -27,12 +37,581 @@ FUNC_COMMAND_MAP = {
     "add_contact": "add",
     "update_contact": "change",
     "get_users_phone": "phone",
+    "search_contacts": "search",
+    "get_phone_owner": "who",
+    "list_contacts": "all",
+    "import_contacts": "import",
+    "export_contacts": "export",
 }
 
 ERR_NAME_AND_PHONE = "Give me name and phone please."
 
 USERS = {}
 
+"""Reverse index of USERS: normalized phone digits -> username."""
+PHONES = {}
+
+"""
+str.translate table deleting phone formatting: hyphens, parentheses, plus
+signs, periods and every character str.isspace() accepts (all of them are
+below U+3001).
+"""
+PHONE_FORMATTING = dict.fromkeys(
+    [ord(char) for char in "-()+."]
+    + [code for code in range(0x3001) if chr(code).isspace()]
+)
+
+DATA_DIR = "contacts_data"
+SNAPSHOT_FILE = "contacts.csv"
+JOURNAL_FILE = "contacts.journal"
+JOURNAL_FSYNC_BATCH = 64
+JOURNAL_COMPACT_THRESHOLD = 100_000
+
+JOURNAL = None
+
+SEARCH_PAGE_SIZE = 10
+ALL_PAGE_SIZE = 20
+
+"""Names per block of the sorted name lists; an insert shifts one block only."""
+NAME_BLOCK = 1000
+
+"""Shortest query given typo suggestions, and candidates scanned per anchor."""
+FUZZY_MIN_LENGTH = 5
+FUZZY_SCAN_LIMIT = 500
+
+"""Rows read, validated and stored together by the import command."""
+IMPORT_BATCH = 10_000
+
+CSV_HEADER = ["User", "Phone"]
+
+
+class ContactJournal:
+    """
+    Durable storage for USERS: a snapshot file plus an append-only journal.
+
+    Every change is appended to the journal as one JSON line before it is
+    applied. Writes are flushed and fsync-ed in batches of fsync_batch
+    records, and on close. Once the journal holds as many records as the
+    snapshot, and at least compact_threshold, it is compacted: the whole
+    store is written to a new snapshot (atomically, via a temporary file and
+    os.replace) and the journal is truncated. Rewriting N contacts thus
+    happens at most once per N changes, so the cost per change stays flat
+    however large the store grows.
+
+    A torn last journal line, left by a crash mid-write, is dropped. Any
+    other line that is not a valid record means the journal is damaged:
+    load raises ValueError and leaves the file untouched.
+
+    Args:
+        directory: Directory holding the snapshot and journal files.
+        fsync_batch: Number of records written between two fsync calls.
+        compact_threshold: Minimum number of journal records that triggers
+            compaction.
+    """
+
+    def __init__(
+        self,
+        directory,
+        fsync_batch=JOURNAL_FSYNC_BATCH,
+        compact_threshold=JOURNAL_COMPACT_THRESHOLD,
+    ):
+        self.directory = directory
+        self.snapshot_path = os.path.join(directory, SNAPSHOT_FILE)
+        self.journal_path = os.path.join(directory, JOURNAL_FILE)
+        self.fsync_batch = fsync_batch
+        self.compact_threshold = compact_threshold
+        self.records = 0
+        self.snapshot_size = 0
+        self._pending = 0
+        self._file = None
+
+    def load(self):
+        """
+        Load the snapshot, replay the journal and open it for appending.
+
+        Returns:
+            dict: Contacts as username -> phone.
+
+        Raises:
+            ValueError: If a complete journal line is not a valid record.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        contacts = {}
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, newline="", encoding="utf-8") as file:
+                contacts.update(csv.reader(file))
+        self.snapshot_size = len(contacts)
+
+        valid_size = 0
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path, "rb") as file:
+                for number, line in enumerate(file, start=1):
+                    if not line.endswith(b"\n"):
+                        break  # torn by a crash, always the last line
+                    record = _parse_record(line)
+                    if record is None:
+                        raise ValueError(
+                            f"Journal {self.journal_path} is damaged at line "
+                            f"{number}. Fix or remove that line and start again."
+                        )
+                    _, username, phone = record
+                    contacts[username] = phone
+                    valid_size += len(line)
+                    self.records += 1
+
+        self._file = open(self.journal_path, "ab")
+        self._file.truncate(valid_size)
+        return contacts
+
+    def append(self, operation, username, phone):
+        """
+        Append one change to the journal.
+
+        Args:
+            operation: Command that made the change, e.g. "add" or "change".
+            username: Contact name.
+            phone: New phone number.
+        """
+        self._file.write(_journal_record(operation, username, phone).encode("utf-8"))
+        self.records += 1
+        self._pending += 1
+        if self._pending >= self.fsync_batch:
+            self.sync()
+
+    def extend(self, operation, contacts):
+        """
+        Append one change per contact to the journal with a single write.
+
+        Args:
+            operation: Command that made the changes, e.g. "import".
+            contacts: List of (username, phone) pairs.
+        """
+        records = "".join(
+            _journal_record(operation, username, phone) for username, phone in contacts
+        )
+        self._file.write(records.encode("utf-8"))
+        self.records += len(contacts)
+        self._pending += len(contacts)
+        if self._pending >= self.fsync_batch:
+            self.sync()
+
+    def sync(self):
+        """
+        Flush buffered journal records and fsync them to disk.
+        """
+        if self._file is None or not self._pending:
+            return
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._pending = 0
+
+    def should_compact(self):
+        """
+        Return True once the journal holds as many records as the snapshot,
+        and at least compact_threshold.
+        """
+        return self.records >= max(self.compact_threshold, self.snapshot_size)
+
+    def compact(self, contacts):
+        """
+        Write *contacts* to a new snapshot and start an empty journal.
+
+        Args:
+            contacts: The full current store (username -> phone).
+        """
+        tmp_path = f"{self.snapshot_path}.tmp"
+        with open(tmp_path, "w", newline="", encoding="utf-8") as file:
+            csv.writer(file).writerows(contacts.items())
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+        _fsync_directory(self.directory)
+
+        self._file.close()
+        self._file = open(self.journal_path, "wb")
+        self.snapshot_size = len(contacts)
+        self.records = 0
+        self._pending = 0
+
+    def close(self):
+        """
+        Sync and close the journal.
+        """
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+            self._file = None
+
+
+def _parse_record(line):
+    """
+    Return the [operation, username, phone] record of a journal line, or None.
+    """
+    try:
+        record = json.loads(line)
+    except ValueError:
+        return None
+    if (
+        isinstance(record, list)
+        and len(record) == 3
+        and all(isinstance(item, str) for item in record)
+    ):
+        return record
+    return None
+
+
+def _journal_record(operation, username, phone):
+    """
+    Return one journal line, the same text as json.dumps of the 3-item list.
+
+    Quoting the strings directly skips the generic encoder, which is most of
+    the cost of journaling a bulk import.
+    """
+    quote = json.encoder.encode_basestring
+    return f"[{quote(operation)}, {quote(username)}, {quote(phone)}]\n"
+
+
+def _fsync_directory(directory):
+    """
+    Make a rename inside *directory* durable, where the OS supports it.
+    """
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _within_one_edit(a, b):
+    """
+    Return True if *a* and *b* differ by at most one insertion, deletion,
+    substitution or swap of two adjacent characters.
+    """
+    if a == b:
+        return True
+    if abs(len(a) - len(b)) > 1:
+        return False
+    if len(a) > len(b):
+        a, b = b, a
+    i = 0
+    while i < len(a) and a[i] == b[i]:
+        i += 1
+    if len(a) < len(b):
+        return a[i:] == b[i + 1 :]
+    if a[i + 1 :] == b[i + 1 :]:
+        return True
+    return (
+        i + 1 < len(a)
+        and a[i] == b[i + 1]
+        and a[i + 1] == b[i]
+        and a[i + 2 :] == b[i + 2 :]
+    )
+
+
+class _SortedNames:
+    """
+    Sorted list of distinct strings, stored as blocks of about NAME_BLOCK.
+
+    A plain sorted list shifts every later item on insert, which costs
+    about a millisecond per name at a million names. Here an insert finds
+    its block by binary search over the block maxima and shifts only that
+    block, so it stays in the microseconds whatever the size. Reading
+    supports len(), iteration and slicing like a list.
+    """
+
+    def __init__(self, names=()):
+        self._load(sorted(set(names)))
+
+    def _load(self, names):
+        self._blocks = [
+            names[i : i + NAME_BLOCK] for i in range(0, len(names), NAME_BLOCK)
+        ]
+        self._maxes = [block[-1] for block in self._blocks]
+        self._len = len(names)
+
+    def __len__(self):
+        return self._len
+
+    def __iter__(self):
+        return chain.from_iterable(self._blocks)
+
+    def _find(self, name):
+        """Return (block number, position in block) where *name* belongs."""
+        number = min(bisect_left(self._maxes, name), len(self._blocks) - 1)
+        return number, bisect_left(self._blocks[number], name)
+
+    def __contains__(self, name):
+        if not self._blocks:
+            return False
+        number, position = self._find(name)
+        block = self._blocks[number]
+        return position < len(block) and block[position] == name
+
+    def add(self, name):
+        """Insert *name*, which must not be in the list yet."""
+        if not self._blocks:
+            self._load([name])
+            return
+        number, position = self._find(name)
+        block = self._blocks[number]
+        block.insert(position, name)
+        self._len += 1
+        self._refresh(number)
+
+    def _refresh(self, number):
+        """Update the maximum of block *number*, splitting it if it grew too big."""
+        block = self._blocks[number]
+        if len(block) <= 2 * NAME_BLOCK:
+            self._maxes[number] = block[-1]
+            return
+        parts = [block[i : i + NAME_BLOCK] for i in range(0, len(block), NAME_BLOCK)]
+        self._blocks[number : number + 1] = parts
+        self._maxes[number : number + 1] = [part[-1] for part in parts]
+
+    def update(self, names):
+        """
+        Insert many *names*, none of them in the list yet.
+
+        A batch that is large next to the list is merged in with one sort;
+        a small one is sorted into the blocks it belongs to, which avoids
+        copying the whole list.
+        """
+        names = sorted(names)
+        if len(names) * 64 < self._len:
+            last = len(self._blocks) - 1
+            groups = {}
+            for name in names:
+                number = min(bisect_left(self._maxes, name), last)
+                groups.setdefault(number, []).append(name)
+            # From the end, so splitting a block does not renumber the next ones.
+            for number in sorted(groups, reverse=True):
+                self._blocks[number].extend(groups[number])
+                self._blocks[number].sort()
+                self._refresh(number)
+            self._len += len(names)
+            return
+        merged = list(self)
+        merged.extend(names)
+        merged.sort()
+        self._load(merged)
+
+    def index(self, name):
+        """Return the position *name* has, or would have, in the whole list."""
+        if not self._blocks:
+            return 0
+        number, position = self._find(name)
+        return sum(map(len, self._blocks[:number])) + position
+
+    def __getitem__(self, items):
+        """Return the names in slice *items* (step not supported) as a list."""
+        start, stop, _ = items.indices(self._len)
+        page = []
+        for block in self._blocks:
+            if start < len(block) and stop > 0:
+                page.extend(block[max(start, 0) : stop])
+            start -= len(block)
+            stop -= len(block)
+            if stop <= 0:
+                break
+        return page
+
+    def starting_with(self, prefix, limit):
+        """Return up to *limit* names starting with *prefix*, in order."""
+        names = []
+        if not self._blocks:
+            return names
+        number, position = self._find(prefix)
+        after = prefix + "\U0010ffff"
+        for block in self._blocks[number:]:
+            end = bisect_left(block, after, position)
+            names.extend(block[position:end])
+            if end < len(block) or len(names) >= limit:
+                break
+            position = 0
+        return names[:limit]
+
+
+class NameIndex:
+    """
+    Search index over contact names, kept in sync with USERS.
+
+    Names are kept sorted (see _SortedNames), so a prefix query is a binary
+    search followed by a slice: O(log n + page size). Typo-tolerant lookups
+    use a second sorted list of the reversed names. A name within one edit
+    of the query keeps either the query's first half or its second half
+    unchanged. So candidates are the names starting with the first half plus
+    the names ending with the second half. Both are contiguous ranges found
+    by binary search. Only queries of FUZZY_MIN_LENGTH or more characters
+    are matched, so each half is at least two characters long. At most
+    FUZZY_SCAN_LIMIT names of each range are checked, which bounds the time
+    of a query; past that limit suggestions may be incomplete.
+    """
+
+    def __init__(self):
+        self.names = _SortedNames()
+        self._reversed = _SortedNames()
+
+    def add(self, name):
+        """
+        Add *name* to the index; adding a known name does nothing.
+        """
+        if name in self.names:
+            return
+        self.names.add(name)
+        self._reversed.add(name[::-1])
+
+    def add_many(self, names):
+        """
+        Add distinct *names*, none of which may be in the index yet.
+
+        See _SortedNames.update for how a batch is inserted.
+        """
+        if not names:
+            return
+        self.names.update(names)
+        self._reversed.update(name[::-1] for name in names)
+
+    def rebuild(self, names):
+        """
+        Replace the index content with *names*.
+        """
+        names = list(names)
+        self.names = _SortedNames(names)
+        self._reversed = _SortedNames(name[::-1] for name in names)
+
+    def clear(self):
+        """
+        Remove all names from the index.
+        """
+        self.rebuild([])
+
+    def prefix(self, prefix, offset=0, limit=SEARCH_PAGE_SIZE):
+        """
+        Return up to *limit* names starting with *prefix*, skipping *offset*.
+        """
+        start = self.names.index(prefix) + offset
+        page = self.names[start : start + limit]
+        return [name for name in page if name.startswith(prefix)]
+
+    def fuzzy(self, query, limit=SEARCH_PAGE_SIZE):
+        """
+        Return up to *limit* names within one typo of *query*, sorted.
+
+        Queries shorter than FUZZY_MIN_LENGTH return no names.
+        """
+        key = query.capitalize()
+        if len(key) < FUZZY_MIN_LENGTH:
+            return []
+        half = len(key) // 2
+        # An edit at or after `half` keeps the head; one before `half`,
+        # including a swap of key[half - 1] and key[half], keeps the tail.
+        candidates = set(self.names.starting_with(key[:half], FUZZY_SCAN_LIMIT))
+        tail = key[half + 1 :][::-1]
+        candidates.update(
+            name[::-1] for name in self._reversed.starting_with(tail, FUZZY_SCAN_LIMIT)
+        )
+        key = key.lower()
+        matches = (
+            name
+            for name in candidates
+            if abs(len(name) - len(key)) <= 1 and _within_one_edit(key, name.lower())
+        )
+        return sorted(matches)[:limit]
+
+
+NAME_INDEX = NameIndex()
+
+
+def open_store(directory=DATA_DIR):
+    """
+    Load USERS from disk and start journaling every change to it.
+
+    Args:
+        directory: Directory holding the snapshot and journal files.
+
+    Raises:
+        ValueError: If the journal is damaged (see ContactJournal).
+    """
+    global JOURNAL
+    journal = ContactJournal(directory)
+    contacts = journal.load()
+    JOURNAL = journal
+    USERS.clear()
+    USERS.update(contacts)
+    NAME_INDEX.rebuild(USERS)
+    PHONES.clear()
+    PHONES.update(
+        (phone.translate(PHONE_FORMATTING), name) for name, phone in USERS.items()
+    )
+
+
+def close_store():
+    """
+    Sync and close the journal and stop journaling.
+
+    Compaction is left to JOURNAL_COMPACT_THRESHOLD, so exiting costs the
+    same whatever the store size; the journal is replayed on next start.
+    """
+    global JOURNAL
+    if JOURNAL is None:
+        return
+    JOURNAL.close()
+    JOURNAL = None
+
+
+def save_contact(operation, username, phone, digits):
+    """
+    Store a contact in USERS, journaling the change first if a store is open.
+
+    Args:
+        operation: Command that made the change, e.g. "add" or "change".
+        username: Contact name.
+        phone: New phone number.
+        digits: Normalized digits of *phone*, as returned by validate_phone.
+    """
+    if JOURNAL is not None:
+        JOURNAL.append(operation, username, phone)
+    if username in USERS:
+        old_digits = USERS[username].translate(PHONE_FORMATTING)
+        if PHONES.get(old_digits) == username:
+            del PHONES[old_digits]
+    USERS[username] = phone
+    PHONES[digits] = username
+    NAME_INDEX.add(username)
+    if JOURNAL is not None and JOURNAL.should_compact():
+        JOURNAL.compact(USERS)
+
+
+def save_contacts(operation, contacts):
+    """
+    Store many contacts at once: one journal write, then a bulk index update.
+
+    Args:
+        operation: Command that made the change, e.g. "import".
+        contacts: List of (username, phone, digits) triples, already
+            validated and checked with check_phone_is_free.
+    """
+    if JOURNAL is not None:
+        JOURNAL.extend(operation, [(name, phone) for name, phone, _ in contacts])
+    new_names = set()
+    for username, phone, digits in contacts:
+        if username in USERS:
+            old_digits = USERS[username].translate(PHONE_FORMATTING)
+            if PHONES.get(old_digits) == username:
+                del PHONES[old_digits]
+        else:
+            new_names.add(username)
+        USERS[username] = phone
+        PHONES[digits] = username
+    NAME_INDEX.add_many(new_names)
+    if JOURNAL is not None and JOURNAL.should_compact():
+        JOURNAL.compact(USERS)
+
 
 def parse_input(user_input):
     """
@@ -83,7 +662,7 @@ def print_dict_as_list(dictionary: dict, headers: list):
     print(f"{tabulate(dictionary.items(), headers=headers, tablefmt='rounded_outline')}")
 
 
-def validate_phone(phone: str) -> None:
+def validate_phone(phone: str) -> str:
     """
     Validate phone number format, raising ValueError if invalid.
 
@@ -93,15 +672,32 @@ def validate_phone(phone: str) -> None:
     Args:
         phone: Phone number string to validate
 
+    Returns:
+        str: The phone's digits with formatting removed, used as PHONES key.
+
     Raises:
         ValueError: If the phone format is invalid.
     """
-    cleaned = re.sub(r"[\s\-\(\)\+\.]", "", phone)
+    cleaned = phone.translate(PHONE_FORMATTING)
     if not (cleaned.isdigit() and 10 <= len(cleaned) <= 15):
         raise ValueError(
             f"Phone '{phone}' is not matching valid format. "
             "Should be digits only, 10 to 15 length."
         )
+    return cleaned
+
+
+def check_phone_is_free(digits, username):
+    """
+    Raise ValueError if the phone *digits* already belong to another user.
+
+    Args:
+        digits: Normalized phone digits, as returned by validate_phone.
+        username: User the phone is about to be assigned to.
+    """
+    owner = PHONES.get(digits)
+    if owner is not None and owner != username:
+        raise ValueError(f"Phone {USERS[owner]} already belongs to '{owner}'.")
 
 
 def input_error(func):
@@ -157,7 +753,7 @@ def add_contact(args):
 
     username = name.capitalize()
 
-    validate_phone(phone)
+    digits = validate_phone(phone)
 
     if username in USERS:
         print_error(
@@ -165,8 +761,9 @@ def add_contact(args):
             f"Use 'change {username} <new_phone>' to update, or use a different username."
         )
         return
+    check_phone_is_free(digits, username)
 
-    USERS[username] = phone
+    save_contact("add", username, phone, digits)
     return f"{IDENT}{BOT_COLOR}Contact added.{Style.RESET_ALL}"
 
 
@@ -191,12 +788,13 @@ def update_contact(args):
 
     username = name.capitalize()
 
-    validate_phone(phone)
+    digits = validate_phone(phone)
 
     if username not in USERS:
         raise KeyError(f"User '{username}' doesn't exist.")
+    check_phone_is_free(digits, username)
 
-    USERS[username] = phone
+    save_contact("change", username, phone, digits)
     return f"{IDENT}{BOT_COLOR}Contact updated.{Style.RESET_ALL}"
 
 
@@ -225,7 +823,271 @@ def get_users_phone(args: list):
     return f"{IDENT}{BOT_COLOR}{username}'s phone is {USERS[username]}{Style.RESET_ALL}"
 
 
-def main():
+@input_error
+def get_phone_owner(args: list):
+    """
+    Find the user a phone number belongs to.
+
+    The number is normalized the same way as on insert, so any formatting
+    of it matches, and looked up in PHONES without scanning USERS.
+
+    Args:
+        args: List where args[0] is the phone number to look up.
+
+    Returns:
+        str: Formatted message with the owner's name.
+
+    Raises:
+        IndexError: If args is empty (no phone provided).
+        ValueError: If the phone format is invalid.
+        KeyError: If no user has this phone.
+    """
+    if not args:
+        raise IndexError("Enter phone number.")
+    phone = "".join(args)
+    owner = PHONES.get(validate_phone(phone))
+    if owner is None:
+        raise KeyError(f"Nobody has phone '{phone}'.")
+
+    return f"{IDENT}{BOT_COLOR}{phone} belongs to {owner}{Style.RESET_ALL}"
+
+
+@input_error
+def search_contacts(args: list):
+    """
+    Find contacts whose name starts with a prefix, or is one typo away.
+
+    Prefix matches are paginated, SEARCH_PAGE_SIZE per page. When nothing
+    starts with the prefix, names within one typo of it are suggested.
+
+    Args:
+        args: List of [prefix] or [prefix, page number].
+
+    Returns:
+        str: Formatted table of matching users and their phones.
+
+    Raises:
+        IndexError: If args is empty (no prefix provided).
+        ValueError: If the page number is not a positive integer.
+    """
+    if not args:
+        raise IndexError("Enter name or its beginning.")
+    prefix = args[0].capitalize()
+    page = args[1] if len(args) > 1 else "1"
+    if not page.isdigit() or int(page) < 1:
+        raise ValueError(f"Page '{page}' is not a positive number.")
+    page = int(page)
+
+    names = NAME_INDEX.prefix(prefix, (page - 1) * SEARCH_PAGE_SIZE, SEARCH_PAGE_SIZE)
+    title = f"Users starting with '{prefix}', page {page}:"
+    if not names and page == 1:
+        names = NAME_INDEX.fuzzy(prefix, SEARCH_PAGE_SIZE)
+        title = f"No users start with '{prefix}'. Did you mean:"
+    rows = [(name, USERS[name]) for name in names if name in USERS]
+    if not rows:
+        return (
+            f"{IDENT}{BOT_ERROR_COLOR}No users found for '{prefix}'.{Style.RESET_ALL}"
+        )
+
+    table = tabulate(rows, headers=["User", "Phone"], tablefmt="rounded_outline")
+    return f"{IDENT}{BOT_COLOR}{title}{Style.RESET_ALL}\n{table}"
+
+
+def _page_number(value, option):
+    """Return *value* as a positive int, or raise ValueError naming *option*."""
+    if not value.isdigit() or int(value) < 1:
+        raise ValueError(f"Option {option} needs a positive number, got '{value}'.")
+    return int(value)
+
+
+@input_error
+def list_contacts(args: list):
+    """
+    Show contacts one page at a time, or stream them as CSV.
+
+    Rows come from the sorted NAME_INDEX, so a page is a list slice and
+    costs the same whatever the store size; the table is only measured
+    for the rows on that page. With --csv rows are written to stdout as
+    they are read, without building a table at all.
+
+    Args:
+        args: Options: "--page N" (default 1), "--size K" (default
+            ALL_PAGE_SIZE) and "--csv". With --csv and no --page every
+            contact is written.
+
+    Returns:
+        str: Formatted table of the page, or None when writing CSV.
+
+    Raises:
+        ValueError: If an option is unknown or its value is not a positive
+            number.
+    """
+    page, size, as_csv = None, ALL_PAGE_SIZE, False
+    options = iter(args)
+    for option in options:
+        if option == "--csv":
+            as_csv = True
+        elif option in ("--page", "--size"):
+            value = _page_number(next(options, ""), option)
+            if option == "--page":
+                page = value
+            else:
+                size = value
+        else:
+            raise ValueError(f"Unknown option '{option}'.")
+
+    if not USERS:
+        print_error("There is no records yet.")
+        return
+
+    names = NAME_INDEX.names
+    if page is not None or not as_csv:
+        start = ((page or 1) - 1) * size
+        names = names[start : start + size]
+
+    if as_csv:
+        writer = csv.writer(sys.stdout)
+        writer.writerow(CSV_HEADER)
+        writer.writerows((name, USERS[name]) for name in names)
+        return
+
+    pages = -(-len(USERS) // size)
+    if not names:
+        raise ValueError(f"Page {page} is out of range, there are {pages} pages.")
+    rows = [(name, USERS[name]) for name in names]
+    table = tabulate(rows, headers=CSV_HEADER, tablefmt="rounded_outline")
+    return f"{table}\n{IDENT}{BOT_COLOR}Page {page or 1} of {pages}{Style.RESET_ALL}"
+
+
+def _validate_rows(rows):
+    """
+    Split CSV rows into contacts that can be stored and a count of rejects.
+
+    A row is accepted if it holds a name without whitespace and a phone that
+    passes the validate_phone rules and does not belong to another user,
+    including users accepted earlier in the same batch.
+
+    The phones of the whole batch are joined and stripped of formatting
+    with a single str.translate call, then split back into rows.
+
+    Returns:
+        tuple: (list of (username, phone, digits), number of rejected rows).
+    """
+    pairs = [row for row in rows if len(row) == 2]
+    batch_digits = "\0".join(phone for _, phone in pairs)
+    batch_digits = batch_digits.translate(PHONE_FORMATTING).split("\0")
+    if len(batch_digits) != len(pairs):  # some phone contained the separator
+        batch_digits = [phone.translate(PHONE_FORMATTING) for _, phone in pairs]
+
+    accepted, claimed = [], {}
+    for (name, phone), digits in zip(pairs, batch_digits):
+        if not (10 <= len(digits) <= 15 and digits.isdigit()):
+            continue
+        if [name] != name.split():
+            continue
+        username = name.capitalize()
+        if claimed.get(digits, PHONES.get(digits, username)) != username:
+            continue
+        claimed[digits] = username
+        accepted.append((username, phone, digits))
+    return accepted, len(rows) - len(accepted)
+
+
+@input_error
+def import_contacts(args: list):
+    """
+    Add or update contacts from a "name,phone" CSV file.
+
+    The file is read IMPORT_BATCH rows at a time; each batch is validated
+    in one pass and stored with save_contacts, so neither the file nor the
+    per-row command path is needed for a large import. A leading
+    "User,Phone" header, as written by export, is skipped.
+
+    Args:
+        args: The path of the CSV file.
+
+    Returns:
+        str: Formatted message with accepted and rejected row counts.
+
+    Raises:
+        IndexError: If args is empty (no path provided).
+        ValueError: If the file can't be read.
+    """
+    if not args:
+        raise IndexError("Enter path to CSV file.")
+    path = " ".join(args)
+
+    accepted = rejected = 0
+    try:
+        with open(path, newline="", encoding="utf-8") as file:
+            reader = csv.reader(file)
+            first = next(reader, None)
+            batch = [] if first is None or first == CSV_HEADER else [first]
+            batch += islice(reader, IMPORT_BATCH - len(batch))
+            while batch:
+                contacts, batch_rejected = _validate_rows(batch)
+                save_contacts("import", contacts)
+                accepted += len(contacts)
+                rejected += batch_rejected
+                batch = list(islice(reader, IMPORT_BATCH))
+    except (OSError, UnicodeDecodeError, csv.Error) as e:
+        raise ValueError(f"Can't read '{path}': {e}")
+
+    return (
+        f"{IDENT}{BOT_COLOR}Imported {accepted} contacts, "
+        f"rejected {rejected} rows.{Style.RESET_ALL}"
+    )
+
+
+@input_error
+def export_contacts(args: list):
+    """
+    Write all contacts to a CSV file that import can read back.
+
+    Args:
+        args: The path of the CSV file.
+
+    Returns:
+        str: Formatted message with the number of exported contacts.
+
+    Raises:
+        IndexError: If args is empty (no path provided).
+        ValueError: If the file can't be written.
+    """
+    if not args:
+        raise IndexError("Enter path to CSV file.")
+    path = " ".join(args)
+
+    try:
+        with open(path, "w", newline="", encoding="utf-8") as file:
+            writer = csv.writer(file)
+            writer.writerow(CSV_HEADER)
+            writer.writerows(USERS.items())
+    except OSError as e:
+        raise ValueError(f"Can't write '{path}': {e}")
+
+    return f"{IDENT}{BOT_COLOR}Exported {len(USERS)} contacts.{Style.RESET_ALL}"
+
+
+def main(data_dir=DATA_DIR):
+    """
+    Entry point: load contacts from data_dir, run the bot, close the store on exit.
+
+    Args:
+        data_dir: Directory holding the contact snapshot and journal.
+    """
+    try:
+        open_store(data_dir)
+    except ValueError as e:
+        print_error(e.args[0])
+        return
+    try:
+        run_bot()
+    finally:
+        close_store()
+
+
+def run_bot():
     """
     Main application loop for the contact management bot.
 
@@ -239,7 +1101,11 @@ def main():
         "add": add_contact,
         "change": update_contact,
         "phone": get_users_phone,
-        "all": lambda args: print_dict_as_list(USERS, ["User", "Phone"]),
+        "search": search_contacts,
+        "who": get_phone_owner,
+        "all": list_contacts,
+        "import": import_contacts,
+        "export": export_contacts,
         "help": lambda args: print_dict_as_list(COMMANDS_HELP_INFO, ["Command", "Usage"]),
     }
 
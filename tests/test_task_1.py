@@ -1,4 +1,16 @@
-from tasks.task_1 import caching_fibonacci
+from concurrent.futures import ThreadPoolExecutor
+import threading
+
+import pytest
+
+from tasks.task_1 import (
+    FibonacciStore,
+    caching_fibonacci,
+    caching_fibonacci_mod,
+    fibonacci_batch,
+    fibonacci_range,
+    threadsafe_caching_fibonacci,
+)
 
 
 def test_base_case_zero():
@@ -76,3 +88,249 @@ def test_larger_value_uses_cache_for_known_entries():
     assert fib.cache_misses == misses_after_warmup + 10
     # previously cached values (≤20) must be reused, not recomputed
     assert fib.cache_hits > 0
+
+
+# --- fast doubling ---
+
+
+def test_doubling_matches_recursive():
+    recursive = caching_fibonacci()
+    doubling = caching_fibonacci("doubling")
+    for n in range(-2, 200):
+        assert doubling(n) == recursive(n), f"fib({n}) mismatch"
+
+
+def test_doubling_handles_indices_beyond_recursion_limit():
+    fib = caching_fibonacci("doubling")
+    # F(n) is divisible by F(d) whenever d divides n
+    assert fib(100_000) % fib(50_000) == 0
+    assert fib(100_000).bit_length() == 69_424
+
+
+def test_doubling_caches_only_log_n_checkpoints():
+    fib = caching_fibonacci("doubling")
+    cache = fib.__closure__[0].cell_contents
+    fib(1_000_000)
+    assert len(cache) <= 2 * (1_000_000).bit_length()
+    assert fib.cache_misses == (1_000_000).bit_length()
+
+
+def test_doubling_resumes_from_cached_checkpoint():
+    fib = caching_fibonacci("doubling")
+    fib(1000)
+    misses_before = fib.cache_misses
+    hits_before = fib.cache_hits
+
+    # 2001 = (1000 << 1) | 1, so only one new doubling step is needed
+    reference = caching_fibonacci("doubling")
+    assert fib(2001) == reference(2001)
+    assert fib.cache_misses == misses_before + 1
+    assert fib.cache_hits == hits_before + 1
+
+    # a checkpoint itself is served straight from cache
+    hits_before = fib.cache_hits
+    fib(500)
+    assert fib.cache_hits == hits_before + 1
+
+
+def test_unknown_method_raises():
+    with pytest.raises(ValueError, match="Unknown method"):
+        caching_fibonacci("matrix")
+
+
+# --- bounded cache ---
+
+
+def test_unbounded_cache_never_evicts():
+    fib = caching_fibonacci()
+    fib(200)
+    assert fib.cache_evictions == 0
+
+
+def test_recursive_rejects_maxsize_below_three():
+    with pytest.raises(ValueError, match="at least 3"):
+        caching_fibonacci(maxsize=2)
+    assert caching_fibonacci("doubling", maxsize=1)(25) == 75025
+
+
+def test_recursive_keeps_working_set_under_small_maxbytes():
+    fib = caching_fibonacci(maxbytes=2)
+    assert fib(28) == 317811
+    assert fib.cache_misses == 27
+    assert fib.cache_evictions > 0
+
+
+def test_maxsize_limits_entry_count():
+    fib = caching_fibonacci(maxsize=10)
+    cache = fib.__closure__[0].cell_contents
+    assert fib(100) == 354224848179261915075
+    assert len(cache) == 10
+    assert fib.cache_evictions == fib.cache_misses - 10
+    # the most recent entries survive
+    assert sorted(cache) == list(range(91, 101))
+
+
+def test_maxbytes_limits_total_value_size():
+    fib = caching_fibonacci("doubling", maxbytes=64)
+    cache = fib.__closure__[0].cell_contents
+    fib(10_000)
+    assert sum((v.bit_length() + 7) // 8 for v in cache.values()) <= 64
+    assert cache.nbytes <= 64
+    assert fib.cache_evictions > 0
+
+
+def test_lru_keeps_recently_used_entries():
+    fib = caching_fibonacci(maxsize=3)
+    cache = fib.__closure__[0].cell_contents
+    fib(5)  # computes 2..5; 2 is the least recently used when 5 is stored
+    assert set(cache) == {3, 4, 5}
+    assert fib.cache_evictions == 1
+    oldest = next(iter(cache))
+    fib(oldest)  # a hit refreshes the entry
+    assert list(cache)[-1] == oldest
+
+
+# --- modular Fibonacci ---
+
+
+def test_fibonacci_mod_matches_full_value():
+    fib = caching_fibonacci("doubling")
+    fib_mod = caching_fibonacci_mod()
+    for m in (1, 2, 10, 97, 1000, 10**9 + 7):
+        for n in (0, 1, 2, 15, 60, 61, 1234):
+            assert fib_mod(n, m) == fib(n) % m, f"F({n}) mod {m}"
+
+
+def test_fibonacci_mod_caches_pisano_period():
+    fib_mod = caching_fibonacci_mod()
+    periods = fib_mod.__closure__[1].cell_contents
+    fib_mod(100, 10)
+    assert len(periods[10]) == 60  # Pisano period of 10
+
+    misses_before = fib_mod.cache_misses
+    assert fib_mod(10**18, 10) == fib_mod(10**18 % 60, 10)
+    assert fib_mod.cache_misses == misses_before
+    assert fib_mod.cache_hits == 2
+
+
+def test_fibonacci_mod_large_modulus_uses_doubling():
+    fib = caching_fibonacci("doubling")
+    fib_mod = caching_fibonacci_mod(pisano_limit=100)
+    periods = fib_mod.__closure__[1].cell_contents
+    assert fib_mod(5000, 1009) == fib(5000) % 1009
+    assert 1009 not in periods
+
+
+def test_fibonacci_mod_rejects_non_positive_modulus():
+    fib_mod = caching_fibonacci_mod()
+    with pytest.raises(ValueError, match="Modulus must be positive"):
+        fib_mod(10, 0)
+
+
+# --- batch / range ---
+
+
+def test_batch_returns_results_in_input_order():
+    fib = caching_fibonacci()
+    indices = [30, 1, 10, 30, 0, -5, 2, 10]
+    assert fibonacci_batch(indices) == [fib(n) for n in indices]
+
+
+def test_batch_jumps_over_large_gaps():
+    fib = caching_fibonacci("doubling")
+    indices = (10_000, 5, 123_456, 10_001)
+    assert fibonacci_batch(iter(indices)) == [fib(n) for n in indices]
+
+
+def test_batch_empty():
+    assert fibonacci_batch([]) == []
+
+
+def test_range_matches_single_values():
+    fib = caching_fibonacci()
+    assert fibonacci_range(-3, 50) == [fib(n) for n in range(-3, 50)]
+    assert fibonacci_range(500, 510) == [fib(n) for n in range(500, 510)]
+    assert fibonacci_range(10, 5) == []
+
+
+def test_batch_as_array_picks_dtype():
+    np = pytest.importorskip("numpy")
+    small = fibonacci_batch([93, 1, 2], as_array=True)
+    assert small.dtype == np.uint64
+    assert int(small[0]) == 12200160415121876738
+    big = fibonacci_range(93, 95, as_array=True)
+    assert big.dtype == object
+
+
+# --- thread-safe cache ---
+
+
+def test_threadsafe_matches_recursive():
+    fib = caching_fibonacci()
+    shared = threadsafe_caching_fibonacci()
+    for n in range(-2, 100):
+        assert shared(n) == fib(n)
+
+
+def test_threadsafe_counters_stay_accurate_under_contention():
+    fib = threadsafe_caching_fibonacci()
+    indices = [2 + i % 50 for i in range(5_000)]
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        results = list(pool.map(fib, indices))
+
+    reference = caching_fibonacci()
+    assert results == [reference(n) for n in indices]
+    # every distinct index is computed exactly once, the rest are hits
+    assert fib.cache_misses == 50
+    assert fib.cache_hits == len(indices) - 50
+
+
+def test_threadsafe_concurrent_callers_share_one_computation():
+    fib = threadsafe_caching_fibonacci()
+    barrier = threading.Barrier(8)
+
+    def call(_):
+        barrier.wait()
+        return fib(200_000)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = set(pool.map(call, range(8)))
+
+    assert len(results) == 1
+    assert fib.cache_misses == 1
+    assert fib.cache_hits == 7
+
+
+# --- persistent store ---
+
+
+def test_store_serves_values_to_a_fresh_instance(tmp_path):
+    path = tmp_path / "fib.sqlite3"
+    with FibonacciStore(path) as store:
+        expected = caching_fibonacci("doubling", store=store)(10_000)
+
+    with FibonacciStore(path) as store:
+        fib = caching_fibonacci("doubling", store=store)
+        assert fib(10_000) == expected
+        assert fib.cache_misses == 0
+        assert fib.cache_hits == 1
+
+
+def test_store_missing_index_returns_none(tmp_path):
+    with FibonacciStore(tmp_path / "fib.sqlite3") as store:
+        assert store.get(42) is None
+        store.put(42, 267914296)
+        assert store.get(42) == 267914296
+
+
+def test_store_discards_data_from_other_version(tmp_path):
+    path = tmp_path / "fib.sqlite3"
+    with FibonacciStore(path) as store:
+        store.put(10, 55)
+
+    class FutureStore(FibonacciStore):
+        VERSION = FibonacciStore.VERSION + 1
+
+    with FutureStore(path) as store:
+        assert store.get(10) is None
@@ -1,6 +1,25 @@
 from decimal import Decimal
+import io
 
-from tasks.task_2 import generator_numbers, sum_profit
+import pytest
+
+from tasks import task_2
+from tasks.task_2 import (
+    ProfitAggregator,
+    generator_numbers,
+    generator_numbers_bytes,
+    generator_numbers_mmap,
+    generator_numbers_stream,
+    sum_profit,
+    sum_profit_fixed,
+    sum_profit_parallel,
+)
+
+EXAMPLE_TEXT = (
+    "Загальний дохід працівника складається з декількох частин: "
+    "1000.01 як основний дохід, доповнений додатковими надходженнями "
+    "27.45 і 324.00 доларів."
+)
 
 
 # --- generator_numbers ---
@@ -77,3 +96,185 @@ def test_sum_profit_custom_generator():
         yield Decimal("30.00")
 
     assert sum_profit("ignored", fixed_generator) == Decimal("60.00")
+
+
+# --- generator_numbers_stream ---
+
+
+TRICKY_TEXT = (
+    EXAMPLE_TEXT + " abc123.45xyz 1.2.3 дохід9.99 7.5\n12345.678901 _1.0 0.5_ 8.25"
+)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 8, 64, 1 << 20])
+def test_stream_matches_in_memory_generator(chunk_size):
+    stream = io.StringIO(TRICKY_TEXT)
+    result = list(generator_numbers_stream(stream, chunk_size=chunk_size))
+    assert result == list(generator_numbers(TRICKY_TEXT))
+
+
+def test_stream_reads_from_path(tmp_path):
+    f = tmp_path / "income.txt"
+    f.write_text(EXAMPLE_TEXT, encoding="utf-8")
+    assert sum_profit(str(f), generator_numbers_stream) == Decimal("1351.46")
+
+
+def test_stream_long_token_without_separators():
+    text = "x" * 100 + "1.5 " + "9" * 50 + ".25"
+    result = list(generator_numbers_stream(io.StringIO(text), chunk_size=4))
+    assert result == [Decimal("9" * 50 + ".25")]
+
+
+# --- sum_profit_fixed ---
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "",
+        "no numbers here at all",
+        EXAMPLE_TEXT,
+        "0.005",
+        "0.004 0.001",
+        "1.1 2.22 3.333 4.4444 5.55555",
+        "0.125 0.125 99999999.995",
+        TRICKY_TEXT,
+    ],
+)
+def test_sum_profit_fixed_identical_to_decimal_path(text):
+    expected = sum_profit(text, generator_numbers)
+    result = sum_profit_fixed(text)
+    assert result == expected
+    assert str(result) == str(expected)
+
+
+def test_sum_profit_fixed_stays_exact_beyond_decimal_precision():
+    # 31 significant digits: the 28-digit Decimal context rounds the addends.
+    text = "12345678901234567890123456.785 0.001"
+    rounded = Decimal("12345678901234567890123456.78")
+    assert sum_profit(text, generator_numbers) == rounded
+    assert sum_profit_fixed(text) == rounded + Decimal("0.01")
+
+
+def test_fixed_paths_handle_totals_beyond_decimal_precision():
+    text = "1234567890123456789012345678.00 99999999999999999999999999999.995"
+    expected = Decimal("101234567890123456789012345678.00")
+    assert sum_profit_fixed(text) == expected
+    assert sum_profit_parallel(text.encode(), workers=1) == expected
+    aggregator = ProfitAggregator()
+    aggregator.feed(text)
+    aggregator.flush()
+    assert aggregator.snapshot() == expected
+
+
+def test_sum_profit_fixed_custom_scale():
+    assert sum_profit_fixed("0.0005 0.0045", scale=4) == Decimal("0.01")
+
+
+# --- sum_profit_parallel ---
+
+
+@pytest.mark.parametrize("workers, shard_size", [(1, 1 << 20), (2, 16), (4, 7), (3, 1)])
+def test_sum_profit_parallel_file_matches_serial(tmp_path, workers, shard_size):
+    text = (TRICKY_TEXT + " 0.005\n") * 20
+    f = tmp_path / "income.txt"
+    f.write_text(text, encoding="utf-8")
+    result = sum_profit_parallel(str(f), workers=workers, shard_size=shard_size)
+    assert result == sum_profit(text, generator_numbers)
+
+
+def test_sum_profit_parallel_buffer_matches_serial():
+    text = (EXAMPLE_TEXT + " 1.125 ") * 50
+    result = sum_profit_parallel(text.encode("utf-8"), workers=2, shard_size=100)
+    assert result == sum_profit(text, generator_numbers)
+
+
+def test_sum_profit_parallel_empty_input():
+    assert sum_profit_parallel(b"", workers=2) == Decimal("0.00")
+
+
+def test_sum_profit_parallel_small_input_skips_process_pool(monkeypatch):
+    def no_pool(*args, **kwargs):
+        raise AssertionError("process pool started for a single shard")
+
+    monkeypatch.setattr(task_2, "ProcessPoolExecutor", no_pool)
+    text = EXAMPLE_TEXT.encode("utf-8")
+    assert sum_profit_parallel(text, workers=4) == Decimal("1351.46")
+    assert sum_profit_parallel(text, workers=4, shard_size=len(text)) == Decimal(
+        "1351.46"
+    )
+
+
+# --- generator_numbers_bytes / generator_numbers_mmap ---
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "",
+        TRICKY_TEXT,
+        "д1.2.3",
+        "1.23д 4.5",
+        "—1.5— «2.25» 3.75\u00a0",
+        "ґ12.34 12.34ї 5.5𝑥 𝑥6.5 7.0😀",
+        "1.2.3.4.5 11.22.33",
+    ],
+)
+def test_bytes_generator_matches_str_generator(text):
+    result = list(generator_numbers_bytes(text.encode("utf-8")))
+    assert result == list(generator_numbers(text))
+
+
+def test_mmap_generator_reads_file(tmp_path):
+    f = tmp_path / "income.txt"
+    f.write_text(TRICKY_TEXT, encoding="utf-8")
+    assert list(generator_numbers_mmap(str(f))) == list(generator_numbers(TRICKY_TEXT))
+
+
+def test_mmap_generator_empty_file(tmp_path):
+    f = tmp_path / "empty.txt"
+    f.write_bytes(b"")
+    assert list(generator_numbers_mmap(str(f))) == []
+
+
+def test_mmap_generator_ignores_numbers_embedded_in_words(tmp_path):
+    f = tmp_path / "income.txt"
+    f.write_text("abc123.45xyz and normal 6.78 value", encoding="utf-8")
+    assert list(generator_numbers_mmap(f)) == [Decimal("6.78")]
+
+
+# --- ProfitAggregator ---
+
+
+@pytest.mark.parametrize("size", [1, 2, 5, 13, 1000])
+def test_aggregator_matches_sum_profit_for_any_fragment_size(size):
+    aggregator = ProfitAggregator()
+    for i in range(0, len(TRICKY_TEXT), size):
+        aggregator.feed(TRICKY_TEXT[i : i + size])
+    aggregator.flush()
+    assert aggregator.snapshot() == sum_profit(TRICKY_TEXT, generator_numbers)
+
+
+def test_aggregator_snapshot_excludes_unfinished_token():
+    aggregator = ProfitAggregator()
+    aggregator.feed("income 10.50\nincome 3.2")
+    assert aggregator.snapshot() == Decimal("10.50")
+    aggregator.feed("5\n")
+    assert aggregator.snapshot() == Decimal("13.75")
+
+
+def test_aggregator_total_is_exact():
+    aggregator = ProfitAggregator()
+    for _ in range(3):
+        aggregator.feed("0.001 ")
+    aggregator.feed("0.0025 ")
+    assert (aggregator.total, aggregator.scale) == (55, 4)
+    assert aggregator.snapshot() == Decimal("0.01")
+
+
+def test_aggregator_merge_combines_shards():
+    left, right = ProfitAggregator(), ProfitAggregator()
+    left.feed("1000.01 27.45 ")
+    right.feed("324.00 0.005")
+    right.flush()
+    assert left.merge(right).snapshot() == Decimal("1351.47")
@@ -1,7 +1,32 @@
 import pytest
 from collections import Counter
 
-from tasks.task_3 import row_generator, count_logs
+import bz2
+import gzip
+import io
+import lzma
+import tempfile
+
+from tasks import task_3
+from tasks.task_3 import (
+    LevelHistogram,
+    LineSink,
+    LogFollower,
+    LogIndex,
+    count_logs_indexed,
+    count_logs_between,
+    count_logs_many,
+    count_log_files,
+    expand_log_paths,
+    find_time_range,
+    iter_count_logs,
+    follow_logs,
+    row_generator,
+    count_logs,
+    count_logs_parallel,
+    main,
+    parse_level,
+)
 
 SAMPLE_LINES = [
     "2024-01-22 08:30:01 INFO User logged in successfully.",
@@ -87,3 +112,534 @@ def test_count_logs_lines_without_level_are_skipped(tmp_path):
     )
     counts, _ = count_logs(["script", str(f)])
     assert sum(counts.values()) == 1
+
+
+def test_count_logs_ignores_levels_in_message_body(tmp_path):
+    f = tmp_path / "body.log"
+    f.write_text(
+        "2024-01-22 11:05:00 DEBUG Retrying after ERROR response.\n"
+        "2024-01-22 11:05:01 INFO Previous WARNING cleared.\n"
+    )
+    counts, _ = count_logs(["script", str(f)])
+    assert counts == Counter({"DEBUG": 1, "INFO": 1})
+
+
+# --- parse_level ---
+
+
+@pytest.mark.parametrize(
+    "line, level",
+    [
+        ("2024-01-22 09:00:45 ERROR Database connection failed.", "ERROR"),
+        ("2024-01-22 09:00:45 warning lower-case token", "WARNING"),
+        ("2024-01-22 11:05:00 DEBUG Received ERROR code", "DEBUG"),
+        ("2024-01-22 11:05:00 INFO", "INFO"),
+        ("2024-01-22 11:05:00 CRITICAL disk ERROR", "ERROR"),  # fallback
+        ("[ERROR] no timestamp", "ERROR"),  # fallback
+        ("2024-01-22 11:05:00 nothing to see", None),
+        ("", None),
+    ],
+)
+def test_parse_level(line, level):
+    assert parse_level(line) == level
+
+
+# --- count_logs_parallel ---
+
+MIXED_LINES = SAMPLE_LINES + [
+    "  2024-01-22 12:00:00 info lower-case level with padding  ",
+    "2024-01-22 12:00:01 WARNING Диск майже заповнений.",
+    "2024-01-22 12:00:02 ınfo dotless i upper-cases to INFO",
+    "2024-01-22 12:00:03 DEBUG Retrying after ERROR response",
+    "\x1c2024-01-22 12:00:04 WARNING unusual leading whitespace",
+    "ERROR line without timestamp",
+    "",
+    "no level here",
+]
+
+
+@pytest.fixture
+def mixed_log_file(tmp_path):
+    f = tmp_path / "mixed.log"
+    body = "\n".join(MIXED_LINES) + "\r\n" + "\r".join(SAMPLE_LINES)
+    f.write_bytes((body * 30).encode("utf-8"))
+    return f
+
+
+@pytest.mark.parametrize("level_filter", [None, "ERROR", "INFO", "WARNING"])
+def test_count_logs_parallel_matches_serial(mixed_log_file, level_filter):
+    argv = ["script", str(mixed_log_file)]
+    expected = count_logs(argv, level_filter)
+    assert count_logs_parallel(argv, level_filter, workers=3, range_size=100) == expected
+
+
+def test_count_logs_parallel_empty_file(tmp_path):
+    f = tmp_path / "empty.log"
+    f.write_text("")
+    assert count_logs_parallel(["script", str(f)], workers=2) == (Counter(), [])
+
+
+def test_count_logs_parallel_small_file_skips_process_pool(log_file, monkeypatch):
+    def no_pool(*args, **kwargs):
+        raise AssertionError("process pool started for a single range")
+
+    monkeypatch.setattr(task_3, "ProcessPoolExecutor", no_pool)
+    argv = ["script", str(log_file)]
+    expected = count_logs(argv, "ERROR")
+    assert count_logs_parallel(argv, "ERROR", workers=4) == expected
+    size = log_file.stat().st_size
+    assert count_logs_parallel(argv, "ERROR", workers=4, range_size=size) == expected
+
+
+def test_count_logs_parallel_file_not_found(capsys):
+    count_logs_parallel(["script", "nonexistent_file.log"])
+    assert "File not found" in capsys.readouterr().out
+
+
+# --- streaming output ---
+
+
+def test_count_logs_sink_receives_lines_instead_of_list(log_file):
+    received = []
+    argv = ["script", str(log_file)]
+    counts, filtered = count_logs(argv, "ERROR", sink=received.append)
+    assert received == [SAMPLE_LINES[1], SAMPLE_LINES[4]]
+    assert filtered == []
+    assert counts["ERROR"] == 2
+
+
+def test_line_sink_writes_in_batches():
+    stream = io.StringIO()
+    sink = LineSink(stream, batch_size=2)
+    sink("first")
+    assert stream.getvalue() == ""
+    sink("second")
+    assert stream.getvalue() == "first\nsecond\n"
+    sink("third")
+    sink.flush()
+    assert stream.getvalue() == "first\nsecond\nthird\n"
+    assert sink.written == 3
+
+
+def test_count_logs_parallel_sink_keeps_file_order(mixed_log_file):
+    argv = ["script", str(mixed_log_file)]
+    received = []
+    count_logs_parallel(argv, "ERROR", workers=2, range_size=100, sink=received.append)
+    assert received == count_logs(argv, "ERROR")[1]
+
+
+def test_main_stream_prints_records_before_table(log_file, capsys):
+    main(["script", str(log_file), "error", "--stream"])
+    out = capsys.readouterr().out
+    assert out.index(SAMPLE_LINES[1]) < out.index("RECORDS COUNT")
+    assert out.index(SAMPLE_LINES[4]) < out.index("RECORDS COUNT")
+
+
+# --- follow mode ---
+
+
+def test_follower_counts_only_appended_lines(tmp_path):
+    f = tmp_path / "live.log"
+    f.write_text("\n".join(SAMPLE_LINES[:2]) + "\n")
+    follower = LogFollower(str(f))
+    assert follower.poll() == 2
+    assert follower.poll() == 0
+
+    with open(f, "a") as file:
+        file.write(SAMPLE_LINES[2] + "\n" + SAMPLE_LINES[3][:15])
+    assert follower.poll() == 1  # the unfinished line waits
+    with open(f, "a") as file:
+        file.write(SAMPLE_LINES[3][15:] + "\n")
+    assert follower.poll() == 1
+    assert follower.counts == Counter({"INFO": 1, "ERROR": 1, "WARNING": 1, "DEBUG": 1})
+    follower.close()
+
+
+def test_follower_passes_new_filtered_lines_to_sink(tmp_path):
+    f = tmp_path / "live.log"
+    f.write_text("\n".join(SAMPLE_LINES) + "\n")
+    received = []
+    follower = LogFollower(str(f), "ERROR", received.append)
+    follower.poll()
+    assert received == [SAMPLE_LINES[1], SAMPLE_LINES[4]]
+    follower.close()
+
+
+def test_follower_reads_in_small_blocks(tmp_path):
+    f = tmp_path / "live.log"
+    f.write_text("\n".join(SAMPLE_LINES) + "\n")
+    received, chunks = [], []
+    follower = LogFollower(str(f), "ERROR", received.append, block_size=7)
+    count = follower._count
+    follower._count = lambda data: chunks.append(len(data)) or count(data)
+    assert follower.poll() == len(SAMPLE_LINES)
+    assert received == [SAMPLE_LINES[1], SAMPLE_LINES[4]]
+    assert follower.counts == Counter({"INFO": 1, "ERROR": 2, "WARNING": 1, "DEBUG": 1})
+    # Each block holds at most the carried partial line plus 7 new bytes.
+    assert max(chunks) <= max(len(line) for line in SAMPLE_LINES) + 7
+    follower.close()
+
+
+def test_follower_handles_truncation(tmp_path):
+    f = tmp_path / "live.log"
+    f.write_text("\n".join(SAMPLE_LINES) + "\n")
+    follower = LogFollower(str(f))
+    follower.poll()
+    f.write_text(SAMPLE_LINES[0] + "\n")  # truncated and rewritten in place
+    assert follower.poll() == 1
+    assert follower.counts["INFO"] == 2
+    follower.close()
+
+
+def test_follower_handles_rotation(tmp_path):
+    f = tmp_path / "live.log"
+    f.write_text(SAMPLE_LINES[0] + "\n")
+    follower = LogFollower(str(f))
+    follower.poll()
+
+    with open(f, "a") as file:
+        file.write(SAMPLE_LINES[1] + "\n")
+    f.rename(tmp_path / "live.log.1")
+    assert follower.poll() == 1  # rest of the rotated file
+    f.write_text(SAMPLE_LINES[4] + "\n")
+    assert follower.poll() == 1
+    assert follower.counts == Counter({"INFO": 1, "ERROR": 2})
+    follower.close()
+
+
+def test_follow_logs_reprints_table(log_file, capsys):
+    counts = follow_logs(str(log_file), interval=0, iterations=2)
+    # the last line has no newline yet, so it is not counted
+    assert counts["ERROR"] == 1
+    assert capsys.readouterr().out.count("RECORDS COUNT") == 2
+
+
+# --- sidecar index ---
+
+
+@pytest.mark.parametrize("level_filter", [None, "ERROR", "INFO", "WARNING"])
+def test_count_logs_indexed_matches_serial(mixed_log_file, level_filter):
+    argv = ["script", str(mixed_log_file)]
+    expected = count_logs(argv, level_filter)
+    assert count_logs_indexed(argv, level_filter) == expected  # builds the index
+    assert count_logs_indexed(argv, level_filter) == expected  # reads it back
+
+
+def test_index_is_written_next_to_log(log_file):
+    count_logs_indexed(["script", str(log_file)])
+    index = LogIndex(str(log_file))
+    assert index.load()
+    assert index.update() is False  # nothing changed since
+    assert len(index.offsets["ERROR"]) == 1  # the last line has no newline yet
+    assert index.counts()["ERROR"] == 2
+
+
+def test_index_extends_incrementally_when_log_grows(tmp_path):
+    f = tmp_path / "grow.log"
+    f.write_text("\n".join(SAMPLE_LINES) + "\n")
+    argv = ["script", str(f)]
+    count_logs_indexed(argv)
+    indexed_before = LogIndex(str(f))
+    indexed_before.load()
+
+    with open(f, "a") as file:
+        file.write(SAMPLE_LINES[1] + "\n")
+    index = LogIndex(str(f))
+    index.load()
+    index.update()
+    assert index.offsets["ERROR"][:2] == indexed_before.offsets["ERROR"]
+    assert len(index.offsets["ERROR"]) == 3
+    assert count_logs_indexed(argv, "ERROR") == count_logs(argv, "ERROR")
+
+
+def test_index_rebuilt_when_log_is_rewritten(tmp_path):
+    f = tmp_path / "rewrite.log"
+    f.write_text("\n".join(SAMPLE_LINES) + "\n")
+    argv = ["script", str(f)]
+    count_logs_indexed(argv)
+    f.write_text("\n".join(reversed(SAMPLE_LINES)) + "\n" + SAMPLE_LINES[0] + "\n")
+    assert count_logs_indexed(argv, "INFO") == count_logs(argv, "INFO")
+
+
+def test_index_ignores_corrupted_sidecar(log_file):
+    (log_file.parent / (log_file.name + ".idx")).write_bytes(b"garbage")
+    argv = ["script", str(log_file)]
+    assert count_logs_indexed(argv, "ERROR") == count_logs(argv, "ERROR")
+
+
+# --- time range queries ---
+
+
+@pytest.fixture
+def sorted_log_file(tmp_path):
+    lines = []
+    for hour in range(24):
+        for minute in range(0, 60, 7):
+            level = ("INFO", "ERROR", "WARNING", "DEBUG")[(hour + minute) % 4]
+            lines.append(f"2024-01-22 {hour:02d}:{minute:02d}:00 {level} Event.")
+            if minute == 14:
+                lines.append("    continuation line without timestamp")
+    f = tmp_path / "sorted.log"
+    f.write_text("\n".join(lines) + "\n")
+    return f, lines
+
+
+def _expected_between(lines, start, end, level_filter=None):
+    window = []
+    inside = False
+    for line in lines:
+        if line[:4].isdigit():
+            inside = line >= start and line[: len(end)] <= end
+        if inside:
+            window.append(line.strip())
+    counts = Counter(lvl for lvl in map(parse_level, window) if lvl)
+    return counts, [line for line in window if parse_level(line) == level_filter]
+
+
+@pytest.mark.parametrize(
+    "start, end",
+    [
+        ("2024-01-22 09", "2024-01-22 09"),
+        ("2024-01-22 09:14", "2024-01-22 10:30:00"),
+        ("2024-01-22 23:59", "2024-01-23"),
+        ("2024-01-21", "2024-01-22 00:07:00"),
+        ("2024-01-22 12", "2024-01-22 11"),
+    ],
+)
+def test_count_logs_between_matches_filtered_scan(sorted_log_file, start, end):
+    f, lines = sorted_log_file
+    argv = ["script", str(f)]
+    result = count_logs_between(argv, "ERROR", start=start, end=end)
+    assert result == _expected_between(lines, start, end, "ERROR")
+
+
+def test_find_time_range_open_ended(sorted_log_file):
+    f, _ = sorted_log_file
+    size = f.stat().st_size
+    assert find_time_range(str(f)) == (0, size)
+    first, last = find_time_range(str(f), start="2024-01-22 23")
+    assert last == size
+    assert f.read_bytes()[first:].startswith(b"2024-01-22 23:00:00")
+
+
+def test_find_time_range_rejects_bad_timestamp(sorted_log_file):
+    f, _ = sorted_log_file
+    with pytest.raises(ValueError, match="Invalid timestamp"):
+        find_time_range(str(f), start="yesterday")
+
+
+# --- compressed logs ---
+
+COMPRESSORS = {".gz": gzip.compress, ".bz2": bz2.compress, ".xz": lzma.compress}
+
+
+@pytest.fixture
+def compressed_logs(tmp_path):
+    data = ("\n".join(MIXED_LINES) + "\n").encode("utf-8")
+    paths = []
+    for suffix, compress in COMPRESSORS.items():
+        f = tmp_path / f"app.log.1{suffix}"
+        f.write_bytes(compress(data))
+        paths.append(str(f))
+    plain = tmp_path / "app.log"
+    plain.write_bytes(data)
+    return paths, str(plain)
+
+
+def test_row_generator_decompresses_by_magic_bytes(compressed_logs):
+    paths, plain = compressed_logs
+    expected = list(row_generator(plain))
+    for path in paths:
+        assert list(row_generator(path)) == expected
+
+
+@pytest.mark.parametrize("suffix", list(COMPRESSORS))
+def test_truncated_compressed_log_reports_error(tmp_path, capsys, suffix):
+    data = ("\n".join(SAMPLE_LINES * 200) + "\n").encode("utf-8")
+    compressed = COMPRESSORS[suffix](data)
+    f = tmp_path / f"app.log.2{suffix}"
+    f.write_bytes(compressed[: len(compressed) // 2])
+    lines = list(row_generator(str(f)))
+    assert len(lines) < len(SAMPLE_LINES) * 200
+    assert f"Can't read {f}" in capsys.readouterr().out
+    main(["script", str(f)])
+    assert "Can't read" in capsys.readouterr().out
+
+
+def test_count_logs_compressed_matches_plain(compressed_logs):
+    paths, plain = compressed_logs
+    expected = count_logs(["script", plain], "ERROR")
+    for path in paths:
+        argv = ["script", path]
+        assert count_logs(argv, "ERROR") == expected
+        assert count_logs_parallel(argv, "ERROR", workers=2) == expected
+        assert count_logs_indexed(argv, "ERROR") == expected
+
+
+def test_count_logs_many_decompresses_in_parallel(compressed_logs):
+    paths, plain = compressed_logs
+    expected = count_logs(["script", plain], "WARNING")
+    results = count_logs_many(paths, "WARNING", workers=3)
+    assert list(results) == paths
+    assert all(result == expected for result in results.values())
+
+
+# --- directories and globs ---
+
+
+@pytest.fixture
+def log_dir(tmp_path):
+    directory = tmp_path / "logs"
+    directory.mkdir()
+    (directory / "app.log").write_text("\n".join(SAMPLE_LINES) + "\n")
+    (directory / "app.log.1.gz").write_bytes(
+        gzip.compress(("\n".join(SAMPLE_LINES[:2]) + "\n").encode())
+    )
+    (directory / "app.log.idx").write_bytes(b"sidecar index, not a log")
+    (directory / "nested").mkdir()
+    return directory
+
+
+def test_expand_log_paths_directory_skips_indexes_and_subdirs(log_dir):
+    assert expand_log_paths(str(log_dir)) == [
+        str(log_dir / "app.log"),
+        str(log_dir / "app.log.1.gz"),
+    ]
+
+
+def test_expand_log_paths_glob_and_plain_file(log_dir):
+    assert expand_log_paths(str(log_dir / "*.gz")) == [str(log_dir / "app.log.1.gz")]
+    assert expand_log_paths(str(log_dir / "missing*")) == []
+    assert expand_log_paths("plain.log") == ["plain.log"]
+
+
+def test_count_log_files_merges_counters(log_dir, capsys):
+    paths = expand_log_paths(str(log_dir))
+    received = []
+    per_file, total = count_log_files(paths, "ERROR", received.append, workers=2)
+    assert per_file[paths[1]] == Counter({"INFO": 1, "ERROR": 1})
+    assert total == Counter({"INFO": 2, "ERROR": 3, "WARNING": 1, "DEBUG": 1})
+    assert received == [SAMPLE_LINES[1], SAMPLE_LINES[4], SAMPLE_LINES[1]]
+    assert "[2/2]" in capsys.readouterr().err
+
+
+def test_count_log_files_reports_bad_files_and_keeps_going(log_dir, capsys):
+    (log_dir / "app.log.2.gz").write_bytes(gzip.compress(b"2024-01-22 x\n" * 100)[:20])
+    (log_dir / "binary.log").write_bytes(b"\xff\xfe\x00\x81 not text")
+    paths = expand_log_paths(str(log_dir))
+    received = []
+    per_file, total = count_log_files(paths, "ERROR", received.append, workers=2)
+    assert total == Counter({"INFO": 2, "ERROR": 3, "WARNING": 1, "DEBUG": 1})
+    assert per_file[str(log_dir / "binary.log")] == Counter()
+    assert received == [SAMPLE_LINES[1], SAMPLE_LINES[4], SAMPLE_LINES[1]]
+    err = capsys.readouterr().err
+    assert f"Can't read {log_dir / 'app.log.2.gz'}" in err
+    assert f"Can't read {log_dir / 'binary.log'}" in err
+
+
+def test_count_log_files_removes_temp_files(log_dir, spool_dir, capsys):
+    count_log_files(expand_log_paths(str(log_dir)), "ERROR", lambda line: None)
+    assert list(spool_dir.iterdir()) == []
+
+
+@pytest.fixture
+def spool_dir(tmp_path, monkeypatch):
+    """Send the temporary files of workers (forked or spawned) to one directory."""
+    spool = tmp_path / "spool"
+    spool.mkdir()
+    monkeypatch.setenv("TMPDIR", str(spool))
+    monkeypatch.setattr(tempfile, "tempdir", str(spool))
+    return spool
+
+
+def test_iter_count_logs_streams_lines_through_temp_files(log_dir, spool_dir):
+    paths = expand_log_paths(str(log_dir))
+    results = iter_count_logs(paths, "ERROR", workers=2)
+    path, counts, lines = next(results)
+    assert path == paths[0]
+    assert list(lines) == [SAMPLE_LINES[1], SAMPLE_LINES[4]]
+    results.close()  # stopping early still removes every temporary file
+    assert list(spool_dir.iterdir()) == []
+
+
+def test_main_rejects_unsupported_options_for_directory(log_dir, capsys):
+    main(["script", str(log_dir), "--histogram", "hour"])
+    assert "can't be used with a directory" in capsys.readouterr().out
+
+
+def test_main_accepts_directory(log_dir, capsys):
+    main(["script", str(log_dir), "error"])
+    out = capsys.readouterr().out
+    assert "is a directory" not in out
+    assert "app.log.1.gz" in out
+    assert out.index(SAMPLE_LINES[4]) < out.index("RECORDS COUNT")
+
+
+# --- histograms ---
+
+
+def test_histogram_filled_in_same_pass_as_counts(log_file):
+    histogram = LevelHistogram("hour")
+    counts, _ = count_logs(["script", str(log_file)], histogram=histogram)
+    assert histogram.rows() == [
+        ["2024-01-22 08", 1, 0, 0, 0],
+        ["2024-01-22 09", 0, 1, 0, 0],
+        ["2024-01-22 10", 0, 0, 1, 0],
+        ["2024-01-22 11", 0, 1, 0, 1],
+    ]
+    totals = [sum(column) for column in zip(*(row[1:] for row in histogram.rows()))]
+    assert totals == [counts[lvl] for lvl in ("INFO", "ERROR", "WARNING", "DEBUG")]
+
+
+def test_histogram_minute_buckets_sorted_and_skip_untimed_lines():
+    histogram = LevelHistogram("minute")
+    histogram.add("2024-01-22 09:01:10 ERROR b", "ERROR")
+    histogram.add("2024-01-22 09:00:59 INFO a", "INFO")
+    histogram.add("2024-01-22 09:01:59 ERROR c", "ERROR")
+    histogram.add("ERROR without timestamp", "ERROR")
+    assert histogram.rows() == [
+        ["2024-01-22 09:00", 1, 0, 0, 0],
+        ["2024-01-22 09:01", 0, 2, 0, 0],
+    ]
+
+
+def test_histogram_csv_output():
+    histogram = LevelHistogram("hour")
+    histogram.add("2024-01-22 09:00:00 WARNING a", "WARNING")
+    stream = io.StringIO()
+    histogram.write_csv(stream)
+    assert stream.getvalue().splitlines() == [
+        "hour,INFO,ERROR,WARNING,DEBUG",
+        "2024-01-22 09,0,0,1,0",
+    ]
+
+
+def test_histogram_respects_time_window(log_file, capsys):
+    main(["script", str(log_file), "--histogram", "hour", "--from", "2024-01-22 10"])
+    out = capsys.readouterr().out
+    assert "2024-01-22 10" in out and "2024-01-22 11" in out
+    assert "2024-01-22 09" not in out
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        ["--histogram", "hour", "--parallel"],
+        ["--histogram", "hour", "--follow"],
+        ["--from", "2024-01-22 10", "--index"],
+        ["--parallel", "--index"],
+    ],
+)
+def test_main_rejects_conflicting_modes(log_file, capsys, options):
+    main(["script", str(log_file), *options])
+    assert "can't be used together" in capsys.readouterr().out
+
+
+def test_main_csv_needs_histogram(log_file, capsys):
+    main(["script", str(log_file), "--csv"])
+    assert "--csv needs --histogram" in capsys.readouterr().out
+
+
+def test_histogram_unknown_bucket_raises():
+    with pytest.raises(ValueError, match="Unknown bucket"):
+        LevelHistogram("day")
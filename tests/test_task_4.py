@@ -1,3 +1,6 @@
+import json
+import os
+
 import pytest
 
 import tasks.task_4 as task4
@@ -7,6 +10,14 @@ from tasks.task_4 import (
     add_contact,
     update_contact,
     get_users_phone,
+    search_contacts,
+    get_phone_owner,
+    list_contacts,
+    import_contacts,
+    export_contacts,
+    open_store,
+    close_store,
+    ContactJournal,
     ERR_NAME_AND_PHONE,
 )
 
@@ -14,8 +25,12 @@ from tasks.task_4 import (
 @pytest.fixture(autouse=True)
 def clear_users():
     task4.USERS.clear()
+    task4.NAME_INDEX.clear()
+    task4.PHONES.clear()
     yield
     task4.USERS.clear()
+    task4.NAME_INDEX.clear()
+    task4.PHONES.clear()
 
 
 # --- parse_input ---
@@ -61,6 +76,10 @@ def test_validate_phone_valid_with_formatting():
     validate_phone("+1 (234) 567-890.1")  # should not raise
 
 
+def test_validate_phone_returns_digits():
+    assert validate_phone("+1 (234) 567-890.1") == "12345678901"
+
+
 def test_validate_phone_too_short_raises():
     with pytest.raises(ValueError, match="not matching valid format"):
         validate_phone("12345")
@@ -161,3 +180,312 @@ def test_get_users_phone_case_insensitive():
     task4.USERS["Alice"] = "1234567890"
     result = get_users_phone(["ALICE"])
     assert "1234567890" in result
+
+
+# --- get_phone_owner ---
+
+
+def test_get_phone_owner_ignores_formatting():
+    add_contact(["john", "+1(234)567-8901"])
+    assert "belongs to John" in get_phone_owner(["1", "234", "567", "8901"])
+    assert "Nobody has phone" in get_phone_owner(["0987654321"])
+    assert "Enter phone number." in get_phone_owner([])
+
+
+def test_get_phone_owner_follows_updates():
+    add_contact(["john", "1234567890"])
+    update_contact(["john", "0987654321"])
+    assert "Nobody has phone" in get_phone_owner(["1234567890"])
+    assert "belongs to John" in get_phone_owner(["0987654321"])
+
+
+def test_duplicate_phone_is_rejected():
+    add_contact(["john", "1234567890"])
+    assert "already belongs to 'John'" in add_contact(["alice", "123-456-7890"])
+    add_contact(["alice", "5555555555"])
+    assert "already belongs to 'John'" in update_contact(["alice", "1234567890"])
+    assert task4.USERS == {"John": "1234567890", "Alice": "5555555555"}
+    assert "Contact updated." in update_contact(["john", "(123) 456 7890"])
+
+
+def test_phone_index_is_rebuilt_on_open(store_dir):
+    open_store(store_dir)
+    add_contact(["john", "1234567890"])
+    close_store()
+    task4.PHONES.clear()
+    open_store(store_dir)
+    assert "belongs to John" in get_phone_owner(["1234567890"])
+
+
+# --- list_contacts ---
+
+
+def test_list_contacts_shows_one_sorted_page(monkeypatch):
+    monkeypatch.setattr(task4, "ALL_PAGE_SIZE", 2)
+    for i, name in enumerate(["carol", "alice", "bob"]):
+        add_contact([name, f"123456789{i}"])
+    first = list_contacts([])
+    assert "Alice" in first and "Bob" in first and "Carol" not in first
+    assert "Page 1 of 2" in first
+    last = list_contacts(["--size", "1", "--page", "3"])
+    assert "Carol" in last and "Page 3 of 3" in last
+
+
+def test_list_contacts_streams_csv(capsys):
+    for i, name in enumerate(["bob", "alice"]):
+        add_contact([name, f"123456789{i}"])
+    assert list_contacts(["--csv"]) is None
+    lines = capsys.readouterr().out.splitlines()
+    assert lines == ["User,Phone", "Alice,1234567891", "Bob,1234567890"]
+    list_contacts(["--csv", "--page", "2", "--size", "1"])
+    assert capsys.readouterr().out.splitlines() == ["User,Phone", "Bob,1234567890"]
+
+
+def test_list_contacts_errors(capsys):
+    assert list_contacts([]) is None
+    assert "no records" in capsys.readouterr().out
+    add_contact(["john", "1234567890"])
+    assert "out of range" in list_contacts(["--page", "2"])
+    assert "positive number" in list_contacts(["--size", "0"])
+    assert "positive number" in list_contacts(["--page"])
+    assert "Unknown option" in list_contacts(["--wide"])
+
+
+# --- import_contacts / export_contacts ---
+
+
+def test_import_contacts_counts_accepted_and_rejected(tmp_path, monkeypatch):
+    monkeypatch.setattr(task4, "IMPORT_BATCH", 2)
+    add_contact(["john", "1234567890"])
+    path = tmp_path / "contacts.csv"
+    path.write_text(
+        "User,Phone\n"
+        "alice,+1 (555) 000-1111\n"
+        "bob,123\n"  # too short
+        "carol,1234567890\n"  # John's phone
+        "dave\n"  # no phone
+        "eve smith,5550002222\n"  # name with a space
+        "frank,5550003333\n"
+        "gina,555-000-3333\n"  # Frank's phone, same batch
+        "john,5550004444\n",  # update
+        encoding="utf-8",
+    )
+    result = import_contacts([str(path)])
+    assert "Imported 3 contacts, rejected 5 rows." in result
+    assert task4.USERS == {
+        "John": "5550004444",
+        "Alice": "+1 (555) 000-1111",
+        "Frank": "5550003333",
+    }
+    assert list(task4.NAME_INDEX.names) == ["Alice", "Frank", "John"]
+    assert "belongs to Alice" in get_phone_owner(["15550001111"])
+    assert "Nobody has phone" in get_phone_owner(["1234567890"])
+
+
+def test_import_normalizes_phones_like_add(tmp_path):
+    path = tmp_path / "contacts.csv"
+    path.write_text(
+        'alice,"+38\u00a0(050)\u2009123.45.67"\nbob,050\x00123456789\n',
+        encoding="utf-8",
+    )
+    assert "Imported 1 contacts, rejected 1 rows." in import_contacts([str(path)])
+    assert "already belongs to 'Alice'" in add_contact(["carol", "+38\u00a0050 1234567"])
+
+
+def test_journal_record_matches_json_dumps():
+    fields = ["import", 'Zoë "Z"', "+38 050\\123"]
+    assert task4._journal_record(*fields) == json.dumps(fields, ensure_ascii=False) + "\n"
+
+
+def test_export_then_import_round_trip(tmp_path, store_dir):
+    open_store(store_dir)
+    add_contact(["john", "1234567890"])
+    add_contact(["alice", "0987654321"])
+    path = tmp_path / "out.csv"
+    assert "Exported 2 contacts." in export_contacts([str(path)])
+    close_store()
+
+    task4.USERS.clear()
+    task4.PHONES.clear()
+    task4.NAME_INDEX.clear()
+    open_store(tmp_path / "other")
+    assert "Imported 2 contacts, rejected 0 rows." in import_contacts([str(path)])
+    close_store()
+    open_store(tmp_path / "other")
+    assert task4.USERS == {"John": "1234567890", "Alice": "0987654321"}
+
+
+def test_import_contacts_errors(tmp_path):
+    assert "Enter path" in import_contacts([])
+    assert "Can't read" in import_contacts([str(tmp_path / "missing.csv")])
+    assert "Can't write" in export_contacts([str(tmp_path / "no" / "dir.csv")])
+
+
+# --- search_contacts ---
+
+
+def test_search_contacts_by_prefix_is_paginated(monkeypatch):
+    monkeypatch.setattr(task4, "SEARCH_PAGE_SIZE", 2)
+    for i, name in enumerate(["anna", "andrew", "anton", "bob"]):
+        add_contact([name, f"123456789{i}"])
+    first = search_contacts(["an"])
+    assert "Andrew" in first and "Anna" in first and "Anton" not in first
+    second = search_contacts(["AN", "2"])
+    assert "Anton" in second and "Bob" not in second
+
+
+def test_search_contacts_suggests_names_with_typo():
+    for i, name in enumerate(["olena", "oleg"]):
+        add_contact([name, f"123456789{i}"])
+    result = search_contacts(["oelna"])
+    assert "Did you mean" in result and "Olena" in result and "Oleg" not in result
+
+
+def test_search_contacts_typo_index_tracks_new_names():
+    add_contact(["olena", "1234567890"])
+    assert "Olena" in search_contacts(["olrna"])
+    add_contact(["mykola", "1234567891"])
+    assert "Mykola" in search_contacts(["mykla"])
+
+
+def test_fuzzy_search_finds_typos_in_either_half():
+    index = task4.NameIndex()
+    index.rebuild(["Olena", "Oleg", "Mykola", "Anna"])
+    assert index.fuzzy("alena") == ["Olena"]  # first letter
+    assert index.fuzzy("myokla") == ["Mykola"]  # swap across the middle
+    assert index.fuzzy("mykolaa") == ["Mykola"]  # insertion at the end
+    assert index.fuzzy("anna") == []  # too short to suggest anything
+
+
+def test_sorted_names_split_blocks_and_slice(monkeypatch):
+    monkeypatch.setattr(task4, "NAME_BLOCK", 2)
+    names = task4._SortedNames(["b", "d"])
+    for name in ["e", "a", "c", "f", "g"]:
+        names.add(name)
+    assert list(names) == list("abcdefg") and len(names) == 7
+    assert len(names._blocks) > 1
+    assert names[2:5] == ["c", "d", "e"] and names[5:100] == ["f", "g"]
+    assert "c" in names and "h" not in names
+    assert names.index("d") == 3 and names.index("z") == 7
+    assert names.starting_with("", 3) == ["a", "b", "c"]
+    names.update(["h", "bb"])
+    assert list(names) == ["a", "b", "bb", "c", "d", "e", "f", "g", "h"]
+
+    many = task4._SortedNames(f"n{i:03d}" for i in range(0, 400, 2))
+    many.update(["n001", "n002x", "n399", "a", "z1", "z2", "z3", "z4"])
+    added = ["n001", "n002x", "n399"]
+    expected = sorted([f"n{i:03d}" for i in range(0, 400, 2)] + added)
+    assert list(many) == ["a", *expected, "z1", "z2", "z3", "z4"]
+    assert len(many) == 208 and max(map(len, many._blocks)) <= 4
+
+
+def test_search_contacts_errors():
+    assert "Enter name" in search_contacts([])
+    assert "not a positive number" in search_contacts(["a", "0"])
+    assert "No users found" in search_contacts(["zed"])
+
+
+def test_search_index_is_rebuilt_on_open(store_dir):
+    open_store(store_dir)
+    add_contact(["john", "1234567890"])
+    close_store()
+    task4.NAME_INDEX.clear()
+    open_store(store_dir)
+    assert "John" in search_contacts(["jo"])
+
+
+# --- persistence ---
+
+
+@pytest.fixture
+def store_dir(tmp_path):
+    yield tmp_path / "store"
+    close_store()
+
+
+def test_store_survives_restart(store_dir):
+    open_store(store_dir)
+    add_contact(["john", "1234567890"])
+    add_contact(["alice", "+1 (234) 567-8901"])
+    update_contact(["john", "0987654321"])
+    close_store()
+    task4.USERS.clear()
+
+    open_store(store_dir)
+    assert task4.USERS == {"John": "0987654321", "Alice": "+1 (234) 567-8901"}
+
+
+def test_journal_replayed_after_crash(store_dir):
+    open_store(store_dir)
+    add_contact(["john", "1234567890"])
+    task4.JOURNAL.sync()  # the process dies here, without close_store()
+    task4.JOURNAL = None
+    task4.USERS.clear()
+
+    journal = ContactJournal(store_dir)
+    assert journal.load() == {"John": "1234567890"}
+    journal.close()
+
+
+def test_torn_journal_tail_is_ignored(store_dir):
+    open_store(store_dir)
+    add_contact(["john", "1234567890"])
+    task4.JOURNAL.sync()
+    with open(task4.JOURNAL.journal_path, "ab") as file:
+        file.write(b'["add", "Alice", "12')
+    task4.JOURNAL = None
+
+    open_store(store_dir)
+    assert task4.USERS == {"John": "1234567890"}
+    add_contact(["bob", "5555555555"])
+    close_store()
+    open_store(store_dir)
+    assert task4.USERS == {"John": "1234567890", "Bob": "5555555555"}
+
+
+def test_journal_compacts_into_snapshot(store_dir):
+    journal = ContactJournal(store_dir, fsync_batch=2, compact_threshold=3)
+    journal.load()
+    task4.JOURNAL = journal
+    for i in range(4):
+        add_contact([f"user{i}", f"100000000{i}"])
+    assert journal.records == 1  # compacted after the third record
+    close_store()
+
+    with open(journal.snapshot_path, encoding="utf-8") as file:
+        assert len(file.readlines()) == 3  # close does not compact
+    open_store(store_dir)
+    assert len(task4.USERS) == 4
+    close_store()
+
+
+@pytest.mark.parametrize(
+    "record", [b"5", b'"abc"', b'{"x": 1, "y": 2, "z": 3}', b'["add", "Alice", 5]']
+)
+def test_damaged_journal_fails_without_losing_records(store_dir, record):
+    open_store(store_dir)
+    add_contact(["john", "1234567890"])
+    close_store()
+    journal_path = os.path.join(store_dir, task4.JOURNAL_FILE)
+    with open(journal_path, "ab") as file:
+        file.write(record + b'\n["add", "Alice", "0987654321"]\n')
+    with open(journal_path, "rb") as file:
+        damaged = file.read()
+
+    with pytest.raises(ValueError, match="damaged at line 2"):
+        open_store(store_dir)
+    assert task4.JOURNAL is None
+    with open(journal_path, "rb") as file:
+        assert file.read() == damaged
+
+
+def test_compaction_threshold_grows_with_snapshot(store_dir):
+    journal = ContactJournal(store_dir, compact_threshold=2)
+    journal.load()
+    task4.JOURNAL = journal
+    for i in range(6):
+        add_contact([f"user{i}", f"100000000{i}"])
+    # Compacted at 2 contacts, then again only after 2 more records (4 contacts).
+    assert journal.snapshot_size == 4
+    assert journal.records == 2
+    close_store()